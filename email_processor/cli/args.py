@@ -1,6 +1,7 @@
 """Command line argument parsing."""
 
 import argparse
+from functools import lru_cache
 
 from email_processor import CONFIG_FILE, __version__
 
@@ -46,8 +47,9 @@ def _add_global_options(parser: argparse.ArgumentParser) -> None:
     )
 
 
-def parse_arguments() -> argparse.Namespace:
-    """Parse command line arguments using subcommands."""
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser once; parsing does not mutate it, so it is reused."""
     parser = argparse.ArgumentParser(
         prog="email-processor",
         description="Email Attachment Processor - Downloads attachments from IMAP, organizes by topic, and archives messages.",
@@ -306,6 +308,12 @@ def parse_arguments() -> argparse.Namespace:
     )
     _add_global_options(status_parser)
 
+    return parser
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parse command line arguments using subcommands."""
+    parser = _build_parser()
     args = parser.parse_args()
 
     # Validate mutually exclusive options
@@ -5,3 +5,6 @@ CONFIG_FILE = "config.yaml"
 
 # Security constants
 MAX_ATTACHMENT_SIZE = 100 * 1024 * 1024  # 100 MB
+
+# IMAP constants
+FETCH_BATCH_SIZE = 100  # Messages whose UID and headers are fetched in one FETCH command
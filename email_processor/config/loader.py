@@ -6,6 +6,9 @@ from typing import Any, Optional
 
 import yaml
 
+# libyaml's C loader when PyYAML was built with it; same safe subset as SafeLoader
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def validate_config(cfg: dict, ui: Optional[Any] = None) -> None:
     """Validate configuration structure and required fields.
@@ -65,6 +68,13 @@ def validate_config(cfg: dict, ui: Optional[Any] = None) -> None:
                         errors.append("'processing.keep_processed_days' must be >= 0")
                 except (ValueError, TypeError):
                     errors.append("'processing.keep_processed_days' must be an integer")
+            if "fetch_batch_size" in proc:
+                try:
+                    batch_size = int(proc["fetch_batch_size"])
+                    if batch_size < 1:
+                        errors.append("'processing.fetch_batch_size' must be >= 1")
+                except (ValueError, TypeError):
+                    errors.append("'processing.fetch_batch_size' must be an integer")
             if "log_level" in proc:
                 valid_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
                 if proc["log_level"].upper() not in valid_levels:
@@ -168,7 +178,7 @@ def load_config(path: str, ui: Optional[Any] = None) -> dict[str, Any]:
 
     try:
         with config_path.open("r", encoding="utf-8") as f:
-            cfg = yaml.safe_load(f)
+            cfg = yaml.load(f, Loader=YAML_LOADER)
     except yaml.YAMLError as e:
         raise ValueError(f"Invalid YAML syntax in {path}: {e}") from e
     except Exception as e:
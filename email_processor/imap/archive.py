@@ -4,10 +4,12 @@ import imaplib
 
 from email_processor.logging.setup import get_logger
 
+# RFC 2683 advises keeping command lines under 1000 octets
+MAX_UID_SET_LENGTH = 900
 
-def archive_message(mail: imaplib.IMAP4_SSL, uid: str, archive_folder: str) -> None:
-    """Archive message with improved error handling."""
-    logger = get_logger(uid=uid)
+
+def _ensure_archive_folder(mail: imaplib.IMAP4_SSL, archive_folder: str, logger) -> None:
+    """Create the archive folder, tolerating it already existing."""
     try:
         mail.create(archive_folder)
     except imaplib.IMAP4.error as e:
@@ -16,6 +18,58 @@ def archive_message(mail: imaplib.IMAP4_SSL, uid: str, archive_folder: str) -> N
     except Exception as e:
         logger.warning("archive_folder_create_error", archive_folder=archive_folder, error=str(e))
 
+
+def build_uid_sets(uids: list[str], max_length: int = MAX_UID_SET_LENGTH) -> list[str]:
+    """
+    Compress UIDs into IMAP sequence sets such as "1:3,7", each at most max_length long.
+
+    Args:
+        uids: Message UIDs as decimal strings, in any order, duplicates allowed
+        max_length: Maximum length of a single sequence set
+
+    Returns:
+        List of sequence sets covering all UIDs
+    """
+    numbers = sorted({int(uid) for uid in uids})
+    ranges: list[str] = []
+    index = 0
+    while index < len(numbers):
+        end = index
+        while end + 1 < len(numbers) and numbers[end + 1] == numbers[end] + 1:
+            end += 1
+        if end == index:
+            ranges.append(str(numbers[index]))
+        else:
+            ranges.append(f"{numbers[index]}:{numbers[end]}")
+        index = end + 1
+
+    sets: list[str] = []
+    current = ""
+    for item in ranges:
+        if current and len(current) + 1 + len(item) > max_length:
+            sets.append(current)
+            current = item
+        else:
+            current = f"{current},{item}" if current else item
+    if current:
+        sets.append(current)
+    return sets
+
+
+def _uid_set_size(uid_set: str) -> int:
+    """Count the UIDs in a sequence set built by build_uid_sets."""
+    size = 0
+    for item in uid_set.split(","):
+        start, _, end = item.partition(":")
+        size += int(end) - int(start) + 1 if end else 1
+    return size
+
+
+def archive_message(mail: imaplib.IMAP4_SSL, uid: str, archive_folder: str) -> None:
+    """Archive message with improved error handling."""
+    logger = get_logger(uid=uid)
+    _ensure_archive_folder(mail, archive_folder, logger)
+
     try:
         result = mail.uid("COPY", uid, archive_folder)
         if not result or result[0] != "OK":
@@ -42,6 +96,64 @@ def archive_message(mail: imaplib.IMAP4_SSL, uid: str, archive_folder: str) -> N
         logger.error("archive_store_error", error=str(e))
 
 
+def archive_messages(mail: imaplib.IMAP4_SSL, uids: list[str], archive_folder: str) -> None:
+    """Archive several messages with one COPY and STORE per UID set and a single EXPUNGE."""
+    if not uids:
+        return
+    logger = get_logger()
+    _ensure_archive_folder(mail, archive_folder, logger)
+
+    archived = 0
+    for uid_set in build_uid_sets(uids):
+        try:
+            result = mail.uid("COPY", uid_set, archive_folder)
+            if not result or result[0] != "OK":
+                logger.error(
+                    "archive_copy_failed",
+                    archive_folder=archive_folder,
+                    uids=uid_set,
+                    status=result[0] if result else "None",
+                )
+                continue
+        except imaplib.IMAP4.error as e:
+            logger.error(
+                "archive_copy_imap_error", archive_folder=archive_folder, uids=uid_set, error=str(e)
+            )
+            continue
+        except Exception as e:
+            logger.error(
+                "archive_copy_error", archive_folder=archive_folder, uids=uid_set, error=str(e)
+            )
+            continue
+
+        try:
+            result = mail.uid("STORE", uid_set, "+FLAGS", "(\\Deleted)")
+            if not result or result[0] != "OK":
+                logger.error(
+                    "archive_store_failed",
+                    uids=uid_set,
+                    status=result[0] if result else "None",
+                )
+                continue
+        except imaplib.IMAP4.error as e:
+            logger.error("archive_store_imap_error", uids=uid_set, error=str(e))
+            continue
+        except Exception as e:
+            logger.error("archive_store_error", uids=uid_set, error=str(e))
+            continue
+        archived += _uid_set_size(uid_set)
+
+    if not archived:
+        return
+    try:
+        mail.expunge()
+        logger.info("messages_archived", archive_folder=archive_folder, count=archived)
+    except imaplib.IMAP4.error as e:
+        logger.error("archive_expunge_imap_error", error=str(e))
+    except Exception as e:
+        logger.error("archive_expunge_error", error=str(e))
+
+
 class ArchiveManager:
     """Archive manager class for email messages."""
 
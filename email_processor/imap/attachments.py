@@ -1,8 +1,9 @@
 """Attachment handler for processing email attachments."""
 
+import binascii
 import email.message
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional
 
 from email_processor.config.constants import MAX_ATTACHMENT_SIZE
 from email_processor.logging.setup import get_logger
@@ -10,6 +11,44 @@ from email_processor.storage.file_manager import safe_save_path
 from email_processor.utils.disk_utils import check_disk_space
 from email_processor.utils.email_utils import decode_mime_header_value
 
+# Encoded characters decoded per write when streaming base64 attachments
+_BASE64_CHUNK_CHARS = 64 * 1024
+_BASE64_WHITESPACE = str.maketrans("", "", " \t\r\n")
+
+
+def _base64_decoded_size(encoded: str) -> int:
+    """Return the decoded size of a base64 payload without decoding it."""
+    whitespace = sum(encoded.count(ch) for ch in " \t\r\n")
+    padding = 0
+    for ch in reversed(encoded):
+        if ch == "=":
+            padding += 1
+        elif ch not in " \t\r\n":
+            break
+    return (len(encoded) - whitespace) * 3 // 4 - padding
+
+
+def _stream_base64(encoded: str, out: BinaryIO) -> int:
+    """Decode a base64 payload into out in fixed-size chunks.
+
+    Returns:
+        Number of decoded bytes written
+
+    Raises:
+        binascii.Error: If the payload is not valid base64
+    """
+    written = 0
+    pending = ""
+    for start in range(0, len(encoded), _BASE64_CHUNK_CHARS):
+        pending += encoded[start : start + _BASE64_CHUNK_CHARS].translate(_BASE64_WHITESPACE)
+        cut = len(pending) - len(pending) % 4
+        if cut:
+            written += out.write(binascii.a2b_base64(pending[:cut]))
+            pending = pending[cut:]
+    if pending:
+        written += out.write(binascii.a2b_base64(pending))
+    return written
+
 
 class AttachmentHandler:
     """Attachment handler class for processing email attachments."""
@@ -99,12 +138,28 @@ class AttachmentHandler:
                 return (False, 0)
 
             save_path = safe_save_path(str(target_folder), filename)
-            payload = part.get_payload(decode=True)
-            if payload is None:
-                uid_logger.warning("attachment_no_payload", filename=filename)
-                return (False, 0)
-
-            file_size = len(payload)
+            # Base64 attachments are sized up front and decoded straight into the
+            # file, so the decoded payload is never held in memory as a whole
+            encoded = part.get_payload(decode=False)
+            payload: Optional[bytes] = None
+            # Padding inside the payload (concatenated base64) is only decoded correctly
+            # by the email package, so such payloads are not streamed
+            if (
+                isinstance(encoded, str)
+                and encoded.isascii()
+                and part.get("Content-Transfer-Encoding", "").strip().lower() == "base64"
+                and "=" not in encoded.rstrip("= \t\r\n")
+            ):
+                stream_source: Optional[str] = encoded
+                file_size = _base64_decoded_size(encoded)
+            else:
+                stream_source = None
+                decoded = part.get_payload(decode=True)
+                if not isinstance(decoded, bytes):
+                    uid_logger.warning("attachment_no_payload", filename=filename)
+                    return (False, 0)
+                payload = decoded
+                file_size = len(payload)
 
             # Validate attachment size
             if file_size > self.max_size:
@@ -131,8 +186,18 @@ class AttachmentHandler:
                 uid_logger.info("dry_run_save_file", path=str(save_path), size=file_size)
                 return (True, 0)  # Return 0 size in dry_run mode
             else:
-                with save_path.open("wb") as f:
-                    f.write(payload)
+                if stream_source is not None:
+                    try:
+                        with save_path.open("wb") as f:
+                            # Report what was written, not the up-front estimate
+                            file_size = _stream_base64(stream_source, f)
+                    except binascii.Error:
+                        # Malformed base64: fall back to the lenient email decoder
+                        decoded = part.get_payload(decode=True)
+                        payload = decoded if isinstance(decoded, bytes) else b""
+                if payload is not None:
+                    with save_path.open("wb") as f:
+                        file_size = f.write(payload)
             uid_logger.info("file_saved", path=str(save_path))
             return (True, file_size)
         except OSError as e:
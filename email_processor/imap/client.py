@@ -4,6 +4,7 @@ import contextlib
 import email.message
 import imaplib
 import re
+import socket
 import time
 from email import message_from_bytes
 from typing import Optional
@@ -11,6 +12,18 @@ from typing import Optional
 from email_processor.logging.setup import get_logger
 
 
+def _disable_nagle(mail: imaplib.IMAP4_SSL) -> None:
+    """Send small IMAP commands immediately instead of waiting on Nagle's algorithm."""
+    sock = getattr(mail, "sock", None)
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except (OSError, AttributeError) as e:
+        # Not fatal: the connection works, just with default socket options
+        get_logger().debug("imap_tcp_nodelay_unavailable", error=str(e))
+
+
 def imap_connect(
     server: str, user: str, password: str, max_retries: int, retry_delay: int
 ) -> imaplib.IMAP4_SSL:
@@ -22,6 +35,7 @@ def imap_connect(
             logger = get_logger()
             logger.info("imap_connecting", server=server, attempt=attempts, max_retries=max_retries)
             mail = imaplib.IMAP4_SSL(server)
+            _disable_nagle(mail)
             mail.login(user, password)
             logger.info("imap_connected", server=server)
             return mail
@@ -52,8 +52,8 @@ except ImportError:
             """No-op method for compatibility."""
 
 
-from email_processor.config.constants import MAX_ATTACHMENT_SIZE
-from email_processor.imap.archive import archive_message
+from email_processor.config.constants import FETCH_BATCH_SIZE, MAX_ATTACHMENT_SIZE
+from email_processor.imap.archive import archive_message, archive_messages
 from email_processor.imap.attachments import AttachmentHandler
 from email_processor.imap.auth import get_imap_password
 from email_processor.imap.client import imap_connect
@@ -67,9 +67,25 @@ from email_processor.storage.uid_storage import (
     save_processed_uid_for_day,
 )
 from email_processor.utils.context import set_correlation_id, set_request_id
-from email_processor.utils.email_utils import decode_mime_header_value, parse_email_date
+from email_processor.utils.email_utils import (
+    decode_mime_header_value,
+    extract_header_fields,
+    parse_email_date,
+)
+from email_processor.utils.path_utils import count_files_by_extension
 from email_processor.utils.redact import redact_email
 
+HEADER_FIELDS_QUERY = "BODY.PEEK[HEADER.FIELDS (FROM SUBJECT DATE)]"
+
+# Start of a FETCH response item ("<seq> (") and the UID inside it
+_FETCH_SEQ_RE = re.compile(rb"^(\d+) \(")
+_FETCH_UID_RE = re.compile(rb"UID (\d+)")
+
+
+def _msg_id_key(msg_id: Union[bytes, str]) -> bytes:
+    """Return message sequence number as bytes, as used in FETCH responses."""
+    return msg_id if isinstance(msg_id, bytes) else str(msg_id).encode()
+
 
 def get_start_date(days_back: int) -> str:
     """Get start date string for IMAP search."""
@@ -153,6 +169,9 @@ class Fetcher:
         # Progress bar setting (default: True if tqdm is available)
         self.show_progress = bool(proc_cfg.get("show_progress", TQDM_AVAILABLE))
 
+        # Number of messages whose UID and headers are fetched in one round trip
+        self.fetch_batch_size = max(1, int(proc_cfg.get("fetch_batch_size", FETCH_BATCH_SIZE)))
+
         # Extension filtering
         allowed_extensions = proc_cfg.get("allowed_extensions")
         blocked_extensions = proc_cfg.get("blocked_extensions")
@@ -166,6 +185,13 @@ class Fetcher:
         )
         self.uid_storage = UIDStorage(self.processed_dir)
 
+        # Password reused by later process() calls on this instance; dropped when the
+        # server rejects the connection so a changed password is picked up again
+        self._imap_password: Optional[str] = None
+
+        # Target folders already resolved and created, keyed by topic_mapping value
+        self._ensured_dirs: dict[str, Path] = {}
+
     def process(
         self, dry_run: bool = False, mock_mode: bool = False, config_path: Optional[str] = None
     ) -> ProcessingResult:
@@ -218,6 +244,8 @@ class Fetcher:
             )
 
         processed_cache: dict[str, set[str]] = {}
+        # UIDs waiting to be archived together in one COPY/STORE/EXPUNGE
+        archive_queue: list[str] = []
 
         mail: Union[imaplib.IMAP4_SSL, MockIMAP4_SSL, None] = None
         if mock_mode:
@@ -227,7 +255,9 @@ class Fetcher:
         else:
             # Get IMAP password for real connection
             try:
-                imap_password = get_imap_password(self.imap_user, config_path=config_path)
+                if self._imap_password is None:
+                    self._imap_password = get_imap_password(self.imap_user, config_path=config_path)
+                imap_password = self._imap_password
             except ValueError as e:
                 self.logger.error("password_error", error=str(e), error_type=type(e).__name__)
                 metrics.total_time = time.time() - process_start_time
@@ -264,6 +294,7 @@ class Fetcher:
                     self.retry_delay,
                 )
             except ConnectionError as e:
+                self._imap_password = None
                 self.logger.error(
                     "imap_connection_failed", error=str(e), error_type=type(e).__name__
                 )
@@ -381,7 +412,7 @@ class Fetcher:
             error_count = 0
 
             # Create progress bar if enabled
-            email_iter = reversed(email_ids)
+            email_iter = list(reversed(email_ids))
             if self.show_progress and len(email_ids) > 0:
                 pbar = tqdm(
                     email_iter,
@@ -394,11 +425,26 @@ class Fetcher:
                 pbar = email_iter
 
             blocked_count = 0
-            for msg_id in pbar:
+            prefetched: dict[bytes, tuple[str, bytes]] = {}
+            for index, msg_id in enumerate(pbar):
+                # Fetch UIDs and headers for the next batch in a single round trip
+                if index % self.fetch_batch_size == 0:
+                    # Messages go highest sequence number first, so expunging the
+                    # previous batch never renumbers the ones still to be fetched
+                    self._flush_archive_queue(mail, archive_queue)
+                    prefetched = self._prefetch_headers(
+                        mail, email_iter[index : index + self.fetch_batch_size], metrics
+                    )
                 try:
                     email_start = time.time()
                     result, blocked_in_email = self._process_email(
-                        mail, msg_id, processed_cache, dry_run, metrics
+                        mail,
+                        msg_id,
+                        processed_cache,
+                        dry_run,
+                        metrics,
+                        prefetched.get(_msg_id_key(msg_id)),
+                        archive_queue,
                     )
                     email_time = time.time() - email_start
                     metrics.per_email_time.append(email_time)
@@ -458,6 +504,8 @@ class Fetcher:
                             processed=processed_count, skipped=skipped_count, errors=error_count
                         )
 
+            self._flush_archive_queue(mail, archive_queue)
+
             # Close progress bar if it was created
             if self.show_progress and len(email_ids) > 0 and hasattr(pbar, "close"):
                 pbar.close()
@@ -475,13 +523,11 @@ class Fetcher:
             if processed_count > 0 and not dry_run:
                 try:
                     file_stats = {}
-                    for folder_path_str in self.topic_mapping.values():
+                    # Several rules may share a folder; scan each folder once
+                    for folder_path_str in dict.fromkeys(self.topic_mapping.values()):
                         folder_path = Path(folder_path_str)
-                        if folder_path.exists() and folder_path.is_dir():
-                            for file_path in folder_path.rglob("*"):
-                                if file_path.is_file():
-                                    ext = file_path.suffix.lower() or "(no extension)"
-                                    file_stats[ext] = file_stats.get(ext, 0) + 1
+                        if folder_path.is_dir():
+                            count_files_by_extension(folder_path, file_stats)
                     if file_stats:
                         sorted_stats = dict(
                             sorted(file_stats.items(), key=lambda x: x[1], reverse=True)
@@ -515,6 +561,8 @@ class Fetcher:
 
         finally:
             if mail:
+                # Archive whatever is still queued if the loop ended early
+                self._flush_archive_queue(mail, archive_queue)
                 try:
                     mail.logout()
                 except (imaplib.IMAP4.error, AttributeError) as e:
@@ -523,28 +571,113 @@ class Fetcher:
                     logging.debug("Unexpected error during IMAP logout (non-critical): %s", e)
             logging.info("Script finished.")
 
-    def _process_email(
+    def _flush_archive_queue(
+        self, mail: Union[imaplib.IMAP4_SSL, MockIMAP4_SSL], archive_queue: list[str]
+    ) -> None:
+        """Archive all queued UIDs in bulk and empty the queue."""
+        if not archive_queue:
+            return
+        uids = list(archive_queue)
+        archive_queue.clear()
+        try:
+            archive_messages(mail, uids, self.archive_folder)  # type: ignore[arg-type]
+        except imaplib.IMAP4.error as e:
+            self.logger.error("archive_imap_error", error=str(e), error_type=type(e).__name__)
+        except (ConnectionError, OSError) as e:
+            self.logger.error("archive_connection_error", error=str(e), error_type=type(e).__name__)
+        except Exception as e:
+            self.logger.error("archive_unexpected_error", error=str(e), error_type=type(e).__name__)
+
+    def _prefetch_headers(
+        self,
+        mail: Union[imaplib.IMAP4_SSL, Any],
+        msg_ids: list[bytes],
+        metrics: ProcessingMetrics,
+    ) -> dict[bytes, tuple[str, bytes]]:
+        """
+        Fetch UIDs and From/Subject/Date headers for several messages with one FETCH.
+
+        Args:
+            mail: IMAP connection
+            msg_ids: Message sequence numbers to fetch
+            metrics: Performance metrics to update
+
+        Returns:
+            Mapping of message ID to (uid, header_bytes). Messages missing from the
+            response are left out; _process_email then fetches them one by one.
+        """
+        if not msg_ids:
+            return {}
+        try:
+            imap_start = time.time()
+            status, data = mail.fetch(
+                b",".join(_msg_id_key(msg_id) for msg_id in msg_ids),  # type: ignore[arg-type]
+                f"(UID {HEADER_FIELDS_QUERY})",
+            )
+            metrics.imap_operations += 1
+            metrics.imap_operation_times.append(time.time() - imap_start)
+        except Exception as e:
+            self.logger.warning(
+                "batch_header_fetch_error",
+                count=len(msg_ids),
+                error=str(e),
+                error_type=type(e).__name__,
+            )
+            return {}
+        if status != "OK" or not isinstance(data, list):
+            self.logger.debug("batch_header_fetch_failed", count=len(msg_ids), status=status)
+            return {}
+
+        uids: dict[bytes, bytes] = {}
+        headers: dict[bytes, bytes] = {}
+        seq: Optional[bytes] = None
+        for item in data:
+            if isinstance(item, tuple) and len(item) >= 2 and isinstance(item[0], bytes):
+                seq_match = _FETCH_SEQ_RE.match(item[0])
+                if not seq_match:
+                    seq = None
+                    continue
+                seq = seq_match.group(1)
+                uid_match = _FETCH_UID_RE.search(item[0])
+                if uid_match:
+                    uids[seq] = uid_match.group(1)
+                if isinstance(item[1], bytes):
+                    headers[seq] = item[1]
+            elif isinstance(item, bytes):
+                seq_match = _FETCH_SEQ_RE.match(item)
+                if seq_match:
+                    # A literal-free response of its own, e.g. an unsolicited FLAGS update
+                    seq = seq_match.group(1)
+                elif seq is None or seq in uids:
+                    continue
+                # Some servers send UID after the header literal: b" UID 123)"
+                uid_match = _FETCH_UID_RE.search(item)
+                if uid_match:
+                    uids[seq] = uid_match.group(1)
+
+        return {
+            seq: (uid.decode("ascii"), headers[seq])
+            for seq, uid in uids.items()
+            if headers.get(seq)
+        }
+
+    def _fetch_uid_and_header(
         self,
         mail: Union[imaplib.IMAP4_SSL, Any],
         msg_id: bytes,
-        processed_cache: dict[str, set[str]],
-        dry_run: bool,
         metrics: ProcessingMetrics,
-    ) -> tuple[str, int]:
+    ) -> Union[tuple[str, bytes], str]:
         """
-        Process a single email message.
+        Fetch the UID and the From/Subject/Date header block of a single message.
 
         Args:
             mail: IMAP connection
             msg_id: Message ID
-            processed_cache: Cache of processed UIDs
-            dry_run: If True, simulate processing
             metrics: Performance metrics to update
 
         Returns:
-            Tuple of (result: str, blocked_count: int) where:
-            - result is "processed", "skipped", or "error"
-            - blocked_count is number of blocked attachments in this email
+            (uid, header_bytes) in the same shape as a _prefetch_headers entry, or the
+            result string ("skipped" or "error") when the message cannot be processed
         """
         # Fetch UID
         try:
@@ -558,19 +691,25 @@ class Fetcher:
                     msg_id=msg_id.decode() if isinstance(msg_id, bytes) else str(msg_id),
                     status=status,
                 )
-                return ("skipped", 0)
+                return "skipped"
         except imaplib.IMAP4.error as e:
             msg_id_str = msg_id.decode() if isinstance(msg_id, bytes) else str(msg_id)
             self.logger.warning(
-                "uid_fetch_imap_error", msg_id=msg_id_str, error=str(e), error_type=type(e).__name__
+                "uid_fetch_imap_error",
+                msg_id=msg_id_str,
+                error=str(e),
+                error_type=type(e).__name__,
             )
-            return ("error", 0)
+            return "error"
         except (AttributeError, IndexError, TypeError) as e:
             msg_id_str = msg_id.decode() if isinstance(msg_id, bytes) else str(msg_id)
             self.logger.warning(
-                "uid_fetch_data_error", msg_id=msg_id_str, error=str(e), error_type=type(e).__name__
+                "uid_fetch_data_error",
+                msg_id=msg_id_str,
+                error=str(e),
+                error_type=type(e).__name__,
             )
-            return ("error", 0)
+            return "error"
         except Exception as e:
             msg_id_str = msg_id.decode() if isinstance(msg_id, bytes) else str(msg_id)
             self.logger.warning(
@@ -579,7 +718,7 @@ class Fetcher:
                 error=str(e),
                 error_type=type(e).__name__,
             )
-            return ("error", 0)
+            return "error"
 
         try:
             raw = (
@@ -594,13 +733,13 @@ class Fetcher:
                     "uid_extraction_failed",
                     msg_id=msg_id.decode() if isinstance(msg_id, bytes) else str(msg_id),
                 )
-                return ("skipped", 0)
+                return "skipped"
         except (AttributeError, IndexError, UnicodeDecodeError) as e:
             msg_id_str = msg_id.decode() if isinstance(msg_id, bytes) else str(msg_id)
             self.logger.warning(
                 "uid_parse_error", msg_id=msg_id_str, error=str(e), error_type=type(e).__name__
             )
-            return ("error", 0)
+            return "error"
         except Exception as e:
             msg_id_str = msg_id.decode() if isinstance(msg_id, bytes) else str(msg_id)
             self.logger.warning(
@@ -609,7 +748,7 @@ class Fetcher:
                 error=str(e),
                 error_type=type(e).__name__,
             )
-            return ("error", 0)
+            return "error"
 
         uid_logger = get_logger(uid=uid)
 
@@ -618,36 +757,71 @@ class Fetcher:
             imap_start = time.time()
             status, header_data = mail.fetch(
                 msg_id,  # type: ignore[arg-type]
-                "(BODY.PEEK[HEADER.FIELDS (FROM SUBJECT DATE)])",
+                f"({HEADER_FIELDS_QUERY})",
             )
             metrics.imap_operations += 1
             metrics.imap_operation_times.append(time.time() - imap_start)
             if status != "OK" or not header_data or not header_data[0]:
                 uid_logger.debug("header_fetch_failed", status=status)
-                return ("skipped", 0)
+                return "skipped"
+            header_bytes = (
+                header_data[0][1] if isinstance(header_data[0], tuple) else header_data[0]
+            )
         except imaplib.IMAP4.error as e:
             uid_logger.warning("header_fetch_imap_error", error=str(e), error_type=type(e).__name__)
-            return ("error", 0)
+            return "error"
         except (AttributeError, IndexError, TypeError) as e:
             uid_logger.warning("header_fetch_data_error", error=str(e), error_type=type(e).__name__)
-            return ("error", 0)
+            return "error"
         except Exception as e:
             uid_logger.warning(
                 "header_fetch_unexpected_error", error=str(e), error_type=type(e).__name__
             )
-            return ("error", 0)
+            return "error"
+        return (uid, header_bytes)
+
+    def _process_email(
+        self,
+        mail: Union[imaplib.IMAP4_SSL, Any],
+        msg_id: bytes,
+        processed_cache: dict[str, set[str]],
+        dry_run: bool,
+        metrics: ProcessingMetrics,
+        prefetched: Optional[tuple[str, bytes]] = None,
+        archive_queue: Optional[list[str]] = None,
+    ) -> tuple[str, int]:
+        """
+        Process a single email message.
+
+        Args:
+            mail: IMAP connection
+            msg_id: Message ID
+            processed_cache: Cache of processed UIDs
+            dry_run: If True, simulate processing
+            metrics: Performance metrics to update
+            prefetched: Optional (uid, header_bytes) from _prefetch_headers; when given,
+                the per-message UID and header fetches are skipped
+            archive_queue: Optional list collecting UIDs to archive in bulk later; when
+                given, the message is queued instead of archived immediately
+
+        Returns:
+            Tuple of (result: str, blocked_count: int) where:
+            - result is "processed", "skipped", or "error"
+            - blocked_count is number of blocked attachments in this email
+        """
+        if prefetched is None:
+            fetched = self._fetch_uid_and_header(mail, msg_id, metrics)
+            if isinstance(fetched, str):
+                return (fetched, 0)
+            prefetched = fetched
+        uid, header_bytes = prefetched
+        uid_logger = get_logger(uid=uid)
 
         try:
-            header_bytes = (
-                header_data[0][1] if isinstance(header_data[0], tuple) else header_data[0]
-            )
             if not header_bytes:
                 uid_logger.debug("header_empty")
                 return ("skipped", 0)
-            header_msg = message_from_bytes(header_bytes)
-        except (email.errors.MessageParseError, UnicodeDecodeError) as e:
-            uid_logger.warning("header_parse_error", error=str(e), error_type=type(e).__name__)
-            return ("error", 0)
+            header_fields = extract_header_fields(header_bytes)
         except (AttributeError, IndexError, TypeError) as e:
             uid_logger.warning("header_parse_data_error", error=str(e), error_type=type(e).__name__)
             return ("error", 0)
@@ -657,9 +831,9 @@ class Fetcher:
             )
             return ("error", 0)
 
-        sender = parseaddr(header_msg.get("From", ""))[1]
-        subject = decode_mime_header_value(header_msg.get("Subject", "(no subject)"))
-        date_raw = header_msg.get("Date", "")
+        sender = parseaddr(header_fields.get("from", ""))[1]
+        subject = decode_mime_header_value(header_fields.get("subject", "(no subject)"))
+        date_raw = header_fields.get("date", "")
         dt = parse_email_date(date_raw)
         day_str = dt.strftime("%Y-%m-%d") if dt else "nodate"
 
@@ -710,11 +884,11 @@ class Fetcher:
         mapped_folder = None
         try:
             mapped_folder = self.filter.resolve_folder(subject)
-            target_folder = Path(mapped_folder)
-            target_folder_resolved = target_folder.resolve()
-
-            target_folder_resolved.mkdir(parents=True, exist_ok=True)
-            target_folder = target_folder_resolved
+            target_folder = self._ensured_dirs.get(mapped_folder)
+            if target_folder is None:
+                target_folder = Path(mapped_folder).resolve()
+                target_folder.mkdir(parents=True, exist_ok=True)
+                self._ensured_dirs[mapped_folder] = target_folder
         except (OSError, PermissionError) as e:
             uid_logger.error(
                 "target_folder_create_io_error", error=str(e), error_type=type(e).__name__
@@ -842,6 +1016,8 @@ class Fetcher:
         if mapped_folder and self.archive_only_mapped:
             if dry_run:
                 uid_logger.info("dry_run_archive", archive_folder=self.archive_folder)
+            elif archive_queue is not None:
+                archive_queue.append(uid)
             else:
                 try:
                     archive_message(mail, uid, self.archive_folder)
@@ -1,6 +1,6 @@
 """Email filtering by senders and topics."""
 
-from email_processor.utils.folder_resolver import resolve_custom_folder
+from email_processor.utils.folder_resolver import FolderResolver
 
 
 class EmailFilter:
@@ -17,6 +17,7 @@ class EmailFilter:
         self.allowed_senders = allowed_senders
         self.allowed_lower = {s.lower() for s in allowed_senders}
         self.topic_mapping = topic_mapping
+        self.folder_resolver = FolderResolver(topic_mapping)
 
     def is_allowed_sender(self, sender: str) -> bool:
         """Check if sender is allowed."""
@@ -24,4 +25,4 @@ class EmailFilter:
 
     def resolve_folder(self, subject: str) -> str:
         """Resolve folder based on subject and topic mapping."""
-        return resolve_custom_folder(subject, self.topic_mapping)
+        return self.folder_resolver.resolve(subject)
@@ -43,6 +43,9 @@ class MockIMAP4_SSL:
         msg_id_str = msg_id.decode() if isinstance(msg_id, bytes) else str(msg_id)
         current_date = datetime.now().strftime("%a, %d %b %Y %H:%M:%S +0000")
 
+        if "UID BODY.PEEK[HEADER.FIELDS" in parts:
+            return self._fetch_uid_headers(msg_id_str.split(","))
+
         # Generate test data based on message ID
         if msg_id_str == "1":
             # First message: allowed sender with attachment
@@ -111,15 +114,27 @@ class MockIMAP4_SSL:
         """Mock UID command."""
         if command == "COPY":
             folder = args[0] if args else None
-            self.archived_messages.append((uid, folder))
+            self.archived_messages.extend((item, folder) for item in self._expand_uid_set(uid))
             return ("OK", [b"Message copied"])
         elif command == "STORE":
             # args[0] is "+FLAGS", args[1] is "(\\Deleted)"
             if len(args) >= 2 and ("\\Deleted" in args[1] or "Deleted" in args[1]):
-                self.deleted_messages.append(uid)
+                self.deleted_messages.extend(self._expand_uid_set(uid))
             return ("OK", [b"Flags updated"])
         return ("NO", [b"Unknown command"])
 
+    @staticmethod
+    def _expand_uid_set(uid_set: str) -> list[str]:
+        """Expand a UID sequence set such as "1:3,7" into individual UIDs."""
+        uids: list[str] = []
+        for item in uid_set.split(","):
+            start, _, end = item.partition(":")
+            if end:
+                uids.extend(str(n) for n in range(int(start), int(end) + 1))
+            else:
+                uids.append(start)
+        return uids
+
     def expunge(self) -> tuple[str, list[bytes]]:
         """Mock expunge."""
         return ("OK", [b"Expunged"])
@@ -129,6 +144,26 @@ class MockIMAP4_SSL:
         self.logged_in = False
         return ("OK", [b"Logout successful"])
 
+    def _fetch_uid_headers(self, msg_ids: list[str]) -> tuple[str, list]:
+        """Mock batched FETCH of UID and headers for several messages."""
+        data: list = []
+        for msg_id in msg_ids:
+            uid_status, uid_data = self.fetch(msg_id.encode(), "(UID RFC822.SIZE BODYSTRUCTURE)")
+            header_status, header_data = self.fetch(
+                msg_id.encode(), "(BODY.PEEK[HEADER.FIELDS (FROM SUBJECT DATE)])"
+            )
+            if uid_status != "OK" or header_status != "OK":
+                continue
+            uid = uid_data[0][0].split(b"UID ")[1].split(b" ")[0]
+            header_bytes = header_data[0][1]
+            prefix = b"%s (UID %s BODY[HEADER.FIELDS (FROM SUBJECT DATE)] {%d}" % (
+                msg_id.encode(),
+                uid,
+                len(header_bytes),
+            )
+            data.extend([(prefix, header_bytes), b")"])
+        return ("OK", data)
+
     def _create_header_bytes(self, from_addr: str, subject: str, date: str) -> bytes:
         """Create test email header as bytes."""
         header_lines = [
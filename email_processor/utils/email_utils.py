@@ -24,6 +24,47 @@ def decode_mime_header_value(value: Optional[str]) -> str:
     return result
 
 
+def extract_header_fields(
+    header_bytes: bytes, names: tuple[str, ...] = ("from", "subject", "date")
+) -> dict[str, str]:
+    """Extract a few header fields from raw header bytes without a full MIME parse.
+
+    Only the requested fields are decoded. Folded lines are unfolded, the first
+    occurrence of a field wins, and scanning stops at the blank line ending the headers.
+
+    Args:
+        header_bytes: Raw header block as returned by BODY.PEEK[HEADER.FIELDS (...)]
+        names: Lower-case field names to extract
+
+    Returns:
+        Mapping of lower-case field name to raw (still MIME-encoded) value
+    """
+    fields: dict[str, str] = {}
+    current: Optional[str] = None
+    parts: list[bytes] = []
+
+    def flush() -> None:
+        if current is not None and current not in fields:
+            value = b"".join(parts).strip()
+            fields[current] = value.decode("utf-8", errors="replace")
+
+    for raw_line in header_bytes.split(b"\n"):
+        line = raw_line.rstrip(b"\r")
+        if not line:
+            break
+        if line[:1] in (b" ", b"\t"):
+            if current is not None:
+                parts.append(line)
+            continue
+        flush()
+        name, sep, value = line.partition(b":")
+        field = name.strip().lower().decode("ascii", errors="replace") if sep else None
+        current = field if field in names else None
+        parts = [value]
+    flush()
+    return fields
+
+
 def parse_email_date(date_raw: str) -> Optional[datetime]:
     """Parse email date header with improved error handling."""
     logger = get_logger()
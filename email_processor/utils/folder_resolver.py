@@ -2,6 +2,7 @@
 
 import re
 from functools import lru_cache
+from typing import Optional
 
 from email_processor.logging.setup import get_logger
 
@@ -24,7 +25,6 @@ def resolve_custom_folder(subject: str, topic_mapping: dict[str, str]) -> str:
     Returns:
         Folder path (always returns a value - last one if no match)
     """
-    logger = get_logger()
     items_list = list(topic_mapping.items())
 
     if not items_list:
@@ -32,13 +32,59 @@ def resolve_custom_folder(subject: str, topic_mapping: dict[str, str]) -> str:
 
     # Get the last folder as default (will be used if no pattern matches)
     default_folder = items_list[-1][1]
+    rules = [(pattern, _compile_pattern(pattern), folder) for pattern, folder in items_list[:-1]]
+    return _match_folder(subject, rules, default_folder)
+
+
+# Backreferences and conditional group references are numbered per pattern and would
+# shift once patterns are combined
+_GROUP_REFERENCE_RE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+# Flags of a rule compiled without inline global flags such as (?x), (?s) or (?m)
+_BASE_FLAGS = re.compile("", re.IGNORECASE).flags
+
 
-    # Check all patterns except the last one
-    for pattern, folder in items_list[:-1]:
-        compiled = _compile_pattern(pattern)
-        if compiled.search(subject):
+def _combine_rules(rules: list[tuple[str, re.Pattern, str]]) -> Optional[re.Pattern]:
+    """Combine rule patterns into one regex whose matching group names the first rule to match.
+
+    Each pattern sits in a lookahead anchored at the start of the subject, and the
+    alternatives are tried in rule order, so the result is the same as searching the
+    patterns one by one. Returns None when the patterns cannot be combined safely: an
+    inline global flag in one rule would apply to every rule in the combined pattern.
+    """
+    if not rules or any(
+        _GROUP_REFERENCE_RE.search(pattern) or compiled.flags != _BASE_FLAGS
+        for pattern, compiled, _ in rules
+    ):
+        return None
+    alternatives = "|".join(
+        f"(?=[\\s\\S]*?(?:{pattern}))(?P<_rule{index}>)"
+        for index, (pattern, _, _) in enumerate(rules)
+    )
+    try:
+        return re.compile(f"(?:{alternatives})", re.IGNORECASE)
+    except re.error:
+        return None
+
+
+def _match_folder(
+    subject: str,
+    rules: list[tuple[str, re.Pattern, str]],
+    default_folder: str,
+    combined: Optional[re.Pattern] = None,
+) -> str:
+    """Return the folder of the first rule matching subject, or default_folder."""
+    logger = get_logger()
+    if combined is not None:
+        match = combined.match(subject)
+        if match and match.lastgroup:
+            pattern, _, folder = rules[int(match.lastgroup.removeprefix("_rule"))]
             logger.info("subject_matched", subject=subject, pattern=pattern, folder=folder)
             return folder
+    else:
+        for pattern, compiled, folder in rules:
+            if compiled.search(subject):
+                logger.info("subject_matched", subject=subject, pattern=pattern, folder=folder)
+                return folder
 
     # No pattern matched, use the last folder as default
     logger.debug("subject_no_match_using_default", subject=subject, folder=default_folder)
@@ -56,10 +102,20 @@ class FolderResolver:
             topic_mapping: Dictionary mapping regex patterns to folder names
         """
         self.topic_mapping = topic_mapping
+        # Compile every rule once here instead of looking it up per message
+        items_list = list(topic_mapping.items())
+        self._default_folder: Optional[str] = items_list[-1][1] if items_list else None
+        self._rules = [
+            (pattern, _compile_pattern(pattern), folder) for pattern, folder in items_list[:-1]
+        ]
+        # One regex for all rules, so a subject is matched in a single call
+        self._combined = _combine_rules(self._rules)
 
     def resolve(self, subject: str) -> str:
         """Resolve custom folder based on subject."""
-        return resolve_custom_folder(subject, self.topic_mapping)
+        if self._default_folder is None:
+            raise ValueError("topic_mapping must contain at least one rule")
+        return _match_folder(subject, self._rules, self._default_folder, self._combined)
 
     def _compile_pattern(self, pattern: str) -> re.Pattern:
         """Compile regex pattern with caching."""
@@ -2,6 +2,9 @@
 
 import os
 import re
+from pathlib import Path
+
+from email_processor.logging.setup import get_logger
 
 
 def normalize_folder_name(name: str) -> str:
@@ -16,6 +19,33 @@ def sanitize_filename(filename: str) -> str:
     return os.path.basename(filename)
 
 
+def count_files_by_extension(folder: Path, counts: dict[str, int]) -> None:
+    """
+    Add the files under folder, recursively, to per-extension counts.
+
+    Walks with os.scandir so file types come from the directory entries instead of a
+    separate stat per path. Symlinked directories are not followed, and directories that
+    cannot be read are skipped.
+
+    Args:
+        folder: Directory to scan
+        counts: Mapping of lower-case extension (or "(no extension)") to count, updated in place
+    """
+    pending = [os.fspath(folder)]
+    while pending:
+        path = pending.pop()
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.is_file():
+                        ext = Path(entry.name).suffix.lower() or "(no extension)"
+                        counts[ext] = counts.get(ext, 0) + 1
+        except OSError as e:
+            get_logger().debug("file_stats_scan_error", path=path, error=str(e))
+
+
 class PathUtils:
     """Path utility class."""
 
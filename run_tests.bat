@@ -1,8 +1,14 @@
 @echo off
 REM Run pytest over the test suite (quick run, no coverage).
 REM For coverage, use: py -m tests.run_all_tests or pytest with --cov.
+REM Uses cpu_count - 2 workers, one test file per worker, when pytest-xdist is installed.
 chcp 65001 >nul
 set PYTHONUTF8=1
 echo Running tests...
-py -m pytest tests/ -v
+py -c "import xdist" >nul 2>&1
+if errorlevel 1 (
+    py -m pytest tests/ -v
+) else (
+    py -m pytest tests/ -v -n auto --dist=loadfile
+)
 pause
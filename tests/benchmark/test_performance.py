@@ -9,6 +9,21 @@ from email_processor.imap.fetcher import Fetcher, ProcessingMetrics
 # Backward compatibility alias
 EmailProcessor = Fetcher
 
+# UID, header and message fetch replies for one email
+EMAIL_FETCH_RESPONSES = (
+    ("OK", [(b"UID 123 SIZE 1000", None)]),
+    (
+        "OK",
+        [
+            (
+                None,
+                b"From: test@example.com\r\nSubject: Test\r\nDate: Mon, 1 Jan 2024 12:00:00 +0000\r\n",
+            )
+        ],
+    ),
+    ("OK", [(None, b"From: test@example.com\r\nSubject: Test\r\n\r\nBody")]),
+)
+
 
 class TestPerformanceBenchmarks(unittest.TestCase):
     """Benchmark tests for performance measurement."""
@@ -47,12 +62,14 @@ class TestPerformanceBenchmarks(unittest.TestCase):
         mock_mail.select.return_value = ("OK", [b"1"])
         mock_mail.search.return_value = ("OK", [b"1 2 3"])
 
-        with patch("email_processor.imap.fetcher.imap_connect", return_value=mock_mail):
-            with patch(
+        with (
+            patch("email_processor.imap.fetcher.imap_connect", return_value=mock_mail),
+            patch(
                 "email_processor.imap.fetcher.get_imap_password",
                 return_value="password",
-            ):
-                result = processor.process(dry_run=True, mock_mode=False)
+            ),
+        ):
+            result = processor.process(dry_run=True, mock_mode=False)
 
         # Verify metrics are collected
         self.assertIsNotNone(result.metrics)
@@ -68,29 +85,16 @@ class TestPerformanceBenchmarks(unittest.TestCase):
         mock_mail.select.return_value = ("OK", [b"1"])
         mock_mail.search.return_value = ("OK", [b"1 2 3 4 5"])
 
-        with patch("email_processor.imap.fetcher.imap_connect", return_value=mock_mail):
-            with patch(
+        with (
+            patch("email_processor.imap.fetcher.imap_connect", return_value=mock_mail),
+            patch(
                 "email_processor.imap.fetcher.get_imap_password",
                 return_value="password",
-            ):
-                # Mock fetch operations to return quickly
-                mock_mail.fetch.side_effect = [
-                    ("OK", [(b"UID 123 SIZE 1000", None)]),  # UID fetch
-                    (
-                        "OK",
-                        [
-                            (
-                                None,
-                                b"From: test@example.com\r\nSubject: Test\r\nDate: Mon, 1 Jan 2024 12:00:00 +0000\r\n",
-                            )
-                        ],
-                    ),  # Header fetch
-                    (
-                        "OK",
-                        [(None, b"From: test@example.com\r\nSubject: Test\r\n\r\nBody")],
-                    ),  # Message fetch
-                ]
-                result = processor.process(dry_run=True, mock_mode=False)
+            ),
+        ):
+            # Mock fetch operations to return quickly
+            mock_mail.fetch.side_effect = EMAIL_FETCH_RESPONSES
+            result = processor.process(dry_run=True, mock_mode=False)
 
         # Verify per-email times are collected
         if result.metrics.per_email_time:
@@ -107,12 +111,14 @@ class TestPerformanceBenchmarks(unittest.TestCase):
         mock_mail.select.return_value = ("OK", [b"1"])
         mock_mail.search.return_value = ("OK", [b"1 2"])
 
-        with patch("email_processor.imap.fetcher.imap_connect", return_value=mock_mail):
-            with patch(
+        with (
+            patch("email_processor.imap.fetcher.imap_connect", return_value=mock_mail),
+            patch(
                 "email_processor.imap.fetcher.get_imap_password",
                 return_value="password",
-            ):
-                result = processor.process(dry_run=True, mock_mode=False)
+            ),
+        ):
+            result = processor.process(dry_run=True, mock_mode=False)
 
         # Verify IMAP operation times are collected
         if result.metrics.imap_operation_times:
@@ -131,12 +137,14 @@ class TestPerformanceBenchmarks(unittest.TestCase):
         mock_mail.select.return_value = ("OK", [b"1"])
         mock_mail.search.return_value = ("OK", [b"1"])
 
-        with patch("email_processor.imap.fetcher.imap_connect", return_value=mock_mail):
-            with patch(
+        with (
+            patch("email_processor.imap.fetcher.imap_connect", return_value=mock_mail),
+            patch(
                 "email_processor.imap.fetcher.get_imap_password",
                 return_value="password",
-            ):
-                result = processor.process(dry_run=True, mock_mode=False)
+            ),
+        ):
+            result = processor.process(dry_run=True, mock_mode=False)
 
         # Memory tracking is optional (requires psutil)
         # Just verify the field exists (may be None if psutil not available)
@@ -153,35 +161,17 @@ class TestPerformanceBenchmarks(unittest.TestCase):
         mock_mail.select.return_value = ("OK", [b"1"])
         mock_mail.search.return_value = ("OK", [b" ".join([str(i).encode() for i in range(1, 11)])])
         # Mock fetch operations for each email (3 fetches per email: UID, header, message)
-        fetch_responses = []
-        for _ in range(10):
-            fetch_responses.extend(
-                [
-                    ("OK", [(b"UID 123 SIZE 1000", None)]),  # UID fetch
-                    (
-                        "OK",
-                        [
-                            (
-                                None,
-                                b"From: test@example.com\r\nSubject: Test\r\nDate: Mon, 1 Jan 2024 12:00:00 +0000\r\n",
-                            )
-                        ],
-                    ),  # Header fetch
-                    (
-                        "OK",
-                        [(None, b"From: test@example.com\r\nSubject: Test\r\n\r\nBody")],
-                    ),  # Message fetch
-                ]
-            )
-        mock_mail.fetch.side_effect = fetch_responses
+        mock_mail.fetch.side_effect = EMAIL_FETCH_RESPONSES * 10
 
         start_time = time.time()
-        with patch("email_processor.imap.fetcher.imap_connect", return_value=mock_mail):
-            with patch(
+        with (
+            patch("email_processor.imap.fetcher.imap_connect", return_value=mock_mail),
+            patch(
                 "email_processor.imap.fetcher.get_imap_password",
                 return_value="password",
-            ):
-                result = processor.process(dry_run=True, mock_mode=False)
+            ),
+        ):
+            result = processor.process(dry_run=True, mock_mode=False)
         end_time = time.time()
 
         # Verify total time is tracked
@@ -213,16 +203,18 @@ class TestPerformanceBenchmarks(unittest.TestCase):
         mock_part.get_payload.return_value = b"x" * 1024  # 1KB file
         mock_email.walk.return_value = [mock_part]
 
-        with patch("email_processor.imap.fetcher.imap_connect", return_value=mock_mail):
-            with patch(
+        with (
+            patch("email_processor.imap.fetcher.imap_connect", return_value=mock_mail),
+            patch(
                 "email_processor.imap.fetcher.get_imap_password",
                 return_value="password",
-            ):
-                with patch(
-                    "email_processor.imap.fetcher.message_from_bytes",
-                    return_value=mock_email,
-                ):
-                    result = processor.process(dry_run=False, mock_mode=False)
+            ),
+            patch(
+                "email_processor.imap.fetcher.message_from_bytes",
+                return_value=mock_email,
+            ),
+        ):
+            result = processor.process(dry_run=False, mock_mode=False)
 
         # In dry_run=False, size should be tracked if file was saved
         # Note: This depends on actual file saving, so may be 0 in some test scenarios
@@ -1,5 +1,6 @@
 """Pytest configuration and fixtures."""
 
+import os
 import shutil
 import tempfile
 from pathlib import Path
@@ -7,6 +8,12 @@ from pathlib import Path
 import pytest
 
 
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config):
+    """Use all but two cores for ``-n auto`` so the OS keeps some headroom."""
+    return max(1, (os.cpu_count() or 2) - 2)
+
+
 @pytest.fixture
 def temp_dir():
     """Create a temporary directory for tests."""
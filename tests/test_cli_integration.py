@@ -51,12 +51,14 @@ logging:
         """Test config init command."""
         mock_config_loader_class.load.side_effect = FileNotFoundError("Config not found")
 
-        with patch("sys.argv", ["email_processor", "config", "init"]):
-            with patch("email_processor.cli.commands.config.create_default_config") as mock_create:
-                mock_create.return_value = 0
-                result = main()
-                self.assertEqual(result, 0)
-                mock_create.assert_called_once()
+        with (
+            patch("sys.argv", ["email_processor", "config", "init"]),
+            patch("email_processor.cli.commands.config.create_default_config") as mock_create,
+        ):
+            mock_create.return_value = 0
+            result = main()
+            self.assertEqual(result, 0)
+            mock_create.assert_called_once()
 
     @patch("email_processor.__main__.ConfigLoader")
     def test_config_validate_command(self, mock_config_loader_class):
@@ -67,12 +69,14 @@ logging:
             "allowed_senders": [],
         }
 
-        with patch("sys.argv", ["email_processor", "config", "validate"]):
-            with patch("email_processor.cli.commands.config.validate_config_file") as mock_validate:
-                mock_validate.return_value = 0
-                result = main()
-                self.assertEqual(result, 0)
-                mock_validate.assert_called_once()
+        with (
+            patch("sys.argv", ["email_processor", "config", "validate"]),
+            patch("email_processor.cli.commands.config.validate_config_file") as mock_validate,
+        ):
+            mock_validate.return_value = 0
+            result = main()
+            self.assertEqual(result, 0)
+            mock_validate.assert_called_once()
 
     @patch("email_processor.__main__.ConfigLoader")
     def test_status_command(self, mock_config_loader_class):
@@ -85,12 +89,14 @@ logging:
             "topic_mapping": {"test": "path"},
         }
 
-        with patch("sys.argv", ["email_processor", "status"]):
-            with patch("email_processor.cli.commands.status.show_status") as mock_status:
-                mock_status.return_value = 0
-                result = main()
-                self.assertEqual(result, 0)
-                mock_status.assert_called_once()
+        with (
+            patch("sys.argv", ["email_processor", "status"]),
+            patch("email_processor.cli.commands.status.show_status") as mock_status,
+        ):
+            mock_status.return_value = 0
+            result = main()
+            self.assertEqual(result, 0)
+            mock_status.assert_called_once()
 
     @patch("email_processor.__main__.ConfigLoader")
     @patch("email_processor.cli.commands.passwords.set_password")
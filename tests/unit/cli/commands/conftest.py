@@ -0,0 +1,20 @@
+"""Pytest configuration for CLI command tests."""
+
+from unittest.mock import patch
+
+import keyring
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _stub_keyring():
+    """Never write to or delete from the real keyring during command tests.
+
+    Tests that assert on keyring calls still patch the function they check; this only
+    catches writes they do not patch, so no test touches the OS keychain.
+    """
+    with (
+        patch.object(keyring, "set_password"),
+        patch.object(keyring, "delete_password"),
+    ):
+        yield
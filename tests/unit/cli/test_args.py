@@ -3,7 +3,7 @@
 import unittest
 from unittest.mock import patch
 
-from email_processor.cli.args import parse_arguments
+from email_processor.cli.args import _build_parser, parse_arguments
 
 
 class TestParseArguments(unittest.TestCase):
@@ -164,3 +164,16 @@ class TestParseArguments(unittest.TestCase):
                 parse_arguments()
             # argparse raises SystemExit(2) for argument errors
             self.assertEqual(cm.exception.code, 2)
+
+    def test_parse_arguments_reuses_parser_without_leaking_state(self):
+        """Test that the cached parser is reused and earlier calls do not leak into later ones."""
+        with patch("sys.argv", ["email_processor", "--dry-run", "--config", "other.yaml"]):
+            first = parse_arguments()
+        with patch("sys.argv", ["email_processor"]):
+            second = parse_arguments()
+
+        self.assertIs(_build_parser(), _build_parser())
+        self.assertTrue(first.dry_run)
+        self.assertEqual(first.config, "other.yaml")
+        self.assertFalse(second.dry_run)
+        self.assertNotEqual(second.config, "other.yaml")
@@ -1,9 +1,13 @@
 """Tests for config loader module."""
 
 import unittest
+from pathlib import Path
 from unittest.mock import MagicMock, mock_open, patch
 
-from email_processor.config.loader import ConfigLoader, load_config, validate_config
+import yaml
+
+import email_processor
+from email_processor.config.loader import YAML_LOADER, ConfigLoader, load_config, validate_config
 
 
 class TestConfigValidation(unittest.TestCase):
@@ -167,6 +171,27 @@ class TestConfigValidation(unittest.TestCase):
             validate_config(config)
         self.assertIn("'processing.keep_processed_days' must be an integer", str(context.exception))
 
+    def test_invalid_fetch_batch_size(self):
+        """Test validation fails when fetch_batch_size is below 1 or not an integer."""
+        cases = {
+            0: "'processing.fetch_batch_size' must be >= 1",
+            "many": "'processing.fetch_batch_size' must be an integer",
+        }
+        for value, message in cases.items():
+            with self.subTest(fetch_batch_size=value):
+                config = {
+                    "imap": {
+                        "server": "imap.example.com",
+                        "user": "test@example.com",
+                    },
+                    "processing": {
+                        "fetch_batch_size": value,
+                    },
+                }
+                with self.assertRaises(ValueError) as context:
+                    validate_config(config)
+                self.assertIn(message, str(context.exception))
+
     def test_invalid_log_level(self):
         """Test validation fails when log_level is invalid."""
         config = {
@@ -802,6 +827,18 @@ processing:
                     load_config("config.yaml")
                 self.assertIn("must contain a top-level YAML object", str(context.exception))
 
+    @unittest.skipUnless(yaml.__with_libyaml__, "PyYAML built without libyaml")
+    def test_yaml_loader_uses_libyaml(self):
+        """Test the C-accelerated safe loader is used when libyaml is available."""
+        self.assertIs(YAML_LOADER, yaml.CSafeLoader)
+
+    def test_load_example_config(self):
+        """Test the shipped config.yaml.example loads and validates through the real loader."""
+        example = Path(email_processor.__file__).parent / "config.yaml.example"
+        config = load_config(str(example))
+        self.assertEqual(config["imap"]["server"], "imap.example.com")
+        self.assertIn("topic_mapping", config)
+
 
 class TestConfigLoader(unittest.TestCase):
     """Tests for ConfigLoader class."""
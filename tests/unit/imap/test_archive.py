@@ -3,9 +3,15 @@
 import imaplib
 import logging
 import unittest
-from unittest.mock import MagicMock
-
-from email_processor.imap.archive import ArchiveManager, archive_message
+from unittest.mock import MagicMock, call, patch
+
+from email_processor.imap import archive as archive_module
+from email_processor.imap.archive import (
+    ArchiveManager,
+    archive_message,
+    archive_messages,
+    build_uid_sets,
+)
 from email_processor.logging.setup import setup_logging
 
 
@@ -122,6 +128,88 @@ class TestArchiveMessage(unittest.TestCase):
         self.assertEqual(self.mock_mail.uid.call_count, 1)
         self.mock_mail.expunge.assert_not_called()
 
+    def test_build_uid_sets(self):
+        """Test UIDs are sorted, deduplicated, compressed into ranges and split by length."""
+        self.assertEqual(build_uid_sets(["7", "2", "3", "1", "3", "10"]), ["1:3,7,10"])
+        self.assertEqual(build_uid_sets(["1", "3", "5", "7"], max_length=4), ["1,3", "5,7"])
+        self.assertEqual(build_uid_sets([]), [])
+
+    def test_archive_messages_bulk(self):
+        """Test several UIDs are archived with one COPY, one STORE and one EXPUNGE."""
+        archive_messages(self.mock_mail, ["101", "100", "105"], "INBOX/Processed")
+
+        self.mock_mail.create.assert_called_once_with("INBOX/Processed")
+        self.assertEqual(
+            self.mock_mail.uid.call_args_list,
+            [
+                call("COPY", "100:101,105", "INBOX/Processed"),
+                call("STORE", "100:101,105", "+FLAGS", "(\\Deleted)"),
+            ],
+        )
+        self.mock_mail.expunge.assert_called_once()
+
+    def test_archive_messages_copy_failures(self):
+        """Test nothing is flagged or expunged when COPY fails, and empty input is a no-op."""
+        for side_effect in (
+            [("NO", [b"Copy failed"])],
+            imaplib.IMAP4.error("Copy error"),
+            RuntimeError("Unexpected"),
+        ):
+            with self.subTest(side_effect=side_effect):
+                self.mock_mail.reset_mock()
+                self.mock_mail.uid.side_effect = side_effect
+                archive_messages(self.mock_mail, ["100"], "INBOX/Processed")
+                self.assertEqual(self.mock_mail.uid.call_count, 1)
+                self.mock_mail.expunge.assert_not_called()
+
+        self.mock_mail.reset_mock()
+        archive_messages(self.mock_mail, [], "INBOX/Processed")
+        self.mock_mail.create.assert_not_called()
+
+    @patch.object(archive_module, "get_logger")
+    def test_archive_messages_store_failures(self, mock_get_logger):
+        """Test a set that fails STORE is neither expunged nor counted as archived."""
+        for store_result in (
+            ("NO", [b"Store failed"]),
+            None,
+            imaplib.IMAP4.error("Store error"),
+            RuntimeError("Unexpected"),
+        ):
+            with self.subTest(store_result=store_result):
+                self.mock_mail.reset_mock()
+                mock_get_logger.reset_mock()
+                self.mock_mail.uid.side_effect = [("OK", [b"Message copied"]), store_result]
+                archive_messages(self.mock_mail, ["100", "101"], "INBOX/Processed")
+                self.assertEqual(self.mock_mail.uid.call_count, 2)
+                self.mock_mail.expunge.assert_not_called()
+                mock_get_logger.return_value.error.assert_called_once()
+                mock_get_logger.return_value.info.assert_not_called()
+
+    @patch.object(archive_module, "build_uid_sets", return_value=["100:102", "105"])
+    @patch.object(archive_module, "get_logger")
+    def test_archive_messages_counts_only_flagged_sets(self, mock_get_logger, _mock_sets):
+        """Test a failed set does not stop later sets, and only flagged UIDs are counted."""
+        for failed_set, archived in (("100:102", 1), ("105", 3)):
+
+            def uid(command, uid_set, *args, failed_set=failed_set):
+                if command == "STORE" and uid_set == failed_set:
+                    raise imaplib.IMAP4.error("Store error")
+                return ("OK", [b"Done"])
+
+            with self.subTest(failed_set=failed_set):
+                self.mock_mail.reset_mock()
+                mock_get_logger.reset_mock()
+                self.mock_mail.uid.side_effect = uid
+                archive_messages(self.mock_mail, ["100", "101", "102", "105"], "INBOX/Processed")
+                self.assertEqual(self.mock_mail.uid.call_count, 4)
+                self.mock_mail.expunge.assert_called_once()
+                mock_get_logger.return_value.error.assert_called_once_with(
+                    "archive_store_imap_error", uids=failed_set, error="Store error"
+                )
+                mock_get_logger.return_value.info.assert_called_once_with(
+                    "messages_archived", archive_folder="INBOX/Processed", count=archived
+                )
+
 
 class TestArchiveManager(unittest.TestCase):
     """Tests for ArchiveManager class."""
@@ -145,8 +233,6 @@ class TestArchiveManager(unittest.TestCase):
 
     def test_archive_manager_archive_message_with_mail(self):
         """Test ArchiveManager.archive_message with direct mail object."""
-        import imaplib
-
         # Create a mock that doesn't have _mail attribute
         # MagicMock has all attributes by default, so we need to use spec or delattr
         mock_mail = MagicMock(spec=["create", "uid", "expunge"])
@@ -1,6 +1,9 @@
 """Tests for attachment handler module."""
 
+import base64
+import email.encoders
 import email.message
+import shutil
 import tempfile
 import unittest
 from pathlib import Path
@@ -22,8 +25,6 @@ class TestAttachmentHandler(unittest.TestCase):
 
     def tearDown(self):
         """Clean up."""
-        import shutil
-
         shutil.rmtree(self.temp_dir, ignore_errors=True)
 
     def test_validate_size(self):
@@ -54,6 +55,84 @@ class TestAttachmentHandler(unittest.TestCase):
         saved_file = list(target_folder.glob("test*.pdf"))[0]
         self.assertTrue(saved_file.exists())
 
+    def test_save_attachment_base64_streamed(self):
+        """Test base64 attachments are decoded chunk-wise to identical bytes."""
+        handler = AttachmentHandler()
+        target_folder = self.download_dir / "test_folder"
+        target_folder.mkdir()
+        content = bytes(range(256)) * 40 + b"tail"
+
+        part = email.message.Message()
+        part.set_payload(content)
+        email.encoders.encode_base64(part)
+        part.add_header("Content-Disposition", "attachment", filename="test.pdf")
+
+        with (
+            patch("email_processor.imap.attachments._BASE64_CHUNK_CHARS", 50),
+            patch.object(part, "get_payload", wraps=part.get_payload) as mock_get_payload,
+        ):
+            result = handler.save_attachment(part, target_folder, "123", dry_run=False)
+
+        self.assertEqual(result, (True, len(content)))
+        saved_file = list(target_folder.glob("test*.pdf"))[0]
+        self.assertEqual(saved_file.read_bytes(), content)
+        mock_get_payload.assert_called_once_with(decode=False)
+
+    def test_save_attachment_base64_malformed_falls_back(self):
+        """Test malformed base64 falls back to the email package decoder."""
+        handler = AttachmentHandler()
+        target_folder = self.download_dir / "test_folder"
+        target_folder.mkdir()
+
+        part = email.message.Message()
+        part.set_payload("dGVzdA=\n")
+        part["Content-Transfer-Encoding"] = "base64"
+        part.add_header("Content-Disposition", "attachment", filename="test.pdf")
+
+        result = handler.save_attachment(part, target_folder, "123", dry_run=False)
+        self.assertTrue(result[0])
+        saved_file = list(target_folder.glob("test*.pdf"))[0]
+        self.assertEqual(saved_file.read_bytes(), part.get_payload(decode=True))
+        self.assertEqual(result[1], len(saved_file.read_bytes()))
+
+    def test_save_attachment_base64_inner_padding_not_streamed(self):
+        """Test concatenated base64 with padding mid-stream matches the email decoder."""
+        handler = AttachmentHandler()
+        target_folder = self.download_dir / "test_folder"
+        target_folder.mkdir()
+
+        part = email.message.Message()
+        # Two base64 bodies back to back; the first ends in "=" padding
+        part.set_payload(
+            base64.b64encode(b"x" * 35000).decode()
+            + base64.b64encode(bytes(range(256)) * 100).decode()
+        )
+        part["Content-Transfer-Encoding"] = "base64"
+        part.add_header("Content-Disposition", "attachment", filename="test.pdf")
+
+        result = handler.save_attachment(part, target_folder, "123", dry_run=False)
+        expected = part.get_payload(decode=True)
+        saved_file = list(target_folder.glob("test*.pdf"))[0]
+        self.assertEqual(saved_file.read_bytes(), expected)
+        self.assertEqual(result, (True, len(expected)))
+
+    def test_save_attachment_base64_reports_written_size(self):
+        """Test the returned size is the bytes written, not the up-front estimate."""
+        handler = AttachmentHandler()
+        target_folder = self.download_dir / "test_folder"
+        target_folder.mkdir()
+
+        part = email.message.Message()
+        # Stray non-alphabet characters inflate the estimate but decode to nothing
+        part.set_payload("!!!!dGVzdA==\n")
+        part["Content-Transfer-Encoding"] = "base64"
+        part.add_header("Content-Disposition", "attachment", filename="test.pdf")
+
+        result = handler.save_attachment(part, target_folder, "123", dry_run=False)
+        saved_file = list(target_folder.glob("test*.pdf"))[0]
+        self.assertEqual(saved_file.read_bytes(), b"test")
+        self.assertEqual(result, (True, 4))
+
     def test_save_attachment_dry_run(self):
         """Test attachment saving in dry-run mode."""
         handler = AttachmentHandler()
@@ -1,12 +1,18 @@
 """Tests for IMAP client module."""
 
+import email.message
+import imaplib
 import logging
+import socket
 import unittest
 from unittest.mock import MagicMock, patch
 
 from email_processor.imap.client import IMAPClient, imap_connect
 from email_processor.logging.setup import setup_logging
 
+HEADER_BYTES = b"From: test@example.com\r\nSubject: Test\r\n"
+MSG_BYTES = b"From: test@example.com\r\n\r\nBody"
+
 
 class TestIMAPConnection(unittest.TestCase):
     """Tests for IMAP connection."""
@@ -35,6 +41,23 @@ class TestIMAPConnection(unittest.TestCase):
         mock_imap_class.assert_called_once_with("imap.example.com")
         mock_imap.login.assert_called_once_with("user", "password")
 
+    @patch("email_processor.imap.client.imaplib.IMAP4_SSL")
+    def test_imap_connect_sets_tcp_nodelay(self, mock_imap_class):
+        """Test imap_connect disables Nagle on the socket and tolerates failures."""
+        for side_effect in (None, OSError("Protocol not available")):
+            with self.subTest(side_effect=side_effect):
+                mock_imap = MagicMock()
+                mock_imap.sock.setsockopt.side_effect = side_effect
+                mock_imap_class.return_value = mock_imap
+
+                result = imap_connect("imap.example.com", "user", "password", 3, 1)
+
+                self.assertEqual(result, mock_imap)
+                mock_imap.sock.setsockopt.assert_called_once_with(
+                    socket.IPPROTO_TCP, socket.TCP_NODELAY, 1
+                )
+                mock_imap.login.assert_called_once_with("user", "password")
+
     @patch("email_processor.imap.client.imaplib.IMAP4_SSL")
     @patch("time.sleep")
     def test_imap_connect_retry(self, mock_sleep, mock_imap_class):
@@ -139,24 +162,18 @@ class TestIMAPClient(unittest.TestCase):
 
     def test_imap_client_fetch_headers(self):
         """Test IMAPClient.fetch_headers method."""
-        import email.message
-
         client = IMAPClient("imap.example.com", "user", "password", 3, 1)
         client._mail = MagicMock()
-        header_bytes = b"From: test@example.com\r\nSubject: Test\r\n"
-        client._mail.fetch.return_value = ("OK", [(None, header_bytes)])
+        client._mail.fetch.return_value = ("OK", [(None, HEADER_BYTES)])
 
         result = client.fetch_headers(b"1")
         self.assertIsInstance(result, email.message.Message)
 
     def test_imap_client_fetch_message(self):
         """Test IMAPClient.fetch_message method."""
-        import email.message
-
         client = IMAPClient("imap.example.com", "user", "password", 3, 1)
         client._mail = MagicMock()
-        msg_bytes = b"From: test@example.com\r\n\r\nBody"
-        client._mail.fetch.return_value = ("OK", [(None, msg_bytes)])
+        client._mail.fetch.return_value = ("OK", [(None, MSG_BYTES)])
 
         result = client.fetch_message(b"1")
         self.assertIsInstance(result, email.message.Message)
@@ -181,8 +198,6 @@ class TestIMAPClient(unittest.TestCase):
     @patch("email_processor.imap.client.imaplib.IMAP4_SSL")
     def test_imap_connect_authentication_failed(self, mock_imap_class):
         """Test IMAP connection with authentication failure."""
-        import imaplib
-
         mock_imap = MagicMock()
         auth_error = imaplib.IMAP4.error("AUTHENTICATIONFAILED")
         mock_imap.login.side_effect = auth_error
@@ -195,8 +210,6 @@ class TestIMAPClient(unittest.TestCase):
     @patch("email_processor.imap.client.imaplib.IMAP4_SSL")
     def test_imap_connect_authentication_failed_russian(self, mock_imap_class):
         """Test IMAP connection with Russian authentication error."""
-        import imaplib
-
         mock_imap = MagicMock()
         auth_error = imaplib.IMAP4.error("НЕВЕРНЫЕ УЧЕТНЫЕ ДАННЫЕ")
         mock_imap.login.side_effect = auth_error
@@ -209,8 +222,6 @@ class TestIMAPClient(unittest.TestCase):
     @patch("email_processor.imap.client.imaplib.IMAP4_SSL")
     def test_imap_connect_authentication_failed_bytes(self, mock_imap_class):
         """Test IMAP connection with bytes authentication error."""
-        import imaplib
-
         mock_imap = MagicMock()
         auth_error = imaplib.IMAP4.error(b"AUTHENTICATIONFAILED")
         mock_imap.login.side_effect = auth_error
@@ -224,8 +235,6 @@ class TestIMAPClient(unittest.TestCase):
     @patch("time.sleep")
     def test_imap_connect_imap_error_retry(self, mock_sleep, mock_imap_class):
         """Test IMAP connection retries on non-auth IMAP errors."""
-        import imaplib
-
         mock_imap = MagicMock()
         imap_error = imaplib.IMAP4.error("Temporary error")
         mock_imap.login.side_effect = [imap_error, ("OK", [b"Login successful"])]
@@ -313,8 +322,6 @@ class TestIMAPClient(unittest.TestCase):
     @patch("email_processor.imap.client.imaplib.IMAP4_SSL")
     def test_imap_connect_unicode_error_in_imap_error_str(self, mock_imap_class):
         """Test IMAP connection with Unicode error when converting IMAPError to string."""
-        import imaplib
-
         mock_imap = MagicMock()
 
         # Create an IMAPError that raises UnicodeDecodeError when str() is called
@@ -337,8 +344,6 @@ class TestIMAPClient(unittest.TestCase):
     @patch("email_processor.imap.client.imaplib.IMAP4_SSL")
     def test_imap_connect_unicode_error_in_imap_error_decode(self, mock_imap_class):
         """Test IMAP connection with Unicode error when decoding bytes in IMAPError."""
-        import imaplib
-
         mock_imap = MagicMock()
 
         # Create an IMAPError with bytes that cause decode error, and str() raises UnicodeEncodeError
@@ -361,8 +366,6 @@ class TestIMAPClient(unittest.TestCase):
     @patch("email_processor.imap.client.imaplib.IMAP4_SSL")
     def test_imap_connect_unicode_error_in_auth_logging(self, mock_imap_class):
         """Test IMAP connection with Unicode error in authentication error logging."""
-        import imaplib
-
         mock_imap = MagicMock()
 
         # Create an IMAPError that is detected as auth error and raises Unicode error in logging
@@ -386,8 +389,6 @@ class TestIMAPClient(unittest.TestCase):
     @patch("time.sleep")
     def test_imap_connect_unicode_error_in_retry_logging(self, mock_sleep, mock_imap_class):
         """Test IMAP connection with Unicode error in retry error logging."""
-        import imaplib
-
         mock_imap = MagicMock()
 
         # Create an IMAPError that is NOT auth error and raises Unicode error in logging
@@ -500,8 +501,7 @@ class TestIMAPClient(unittest.TestCase):
         """Test IMAPClient.fetch_headers with string response."""
         client = IMAPClient("imap.example.com", "user", "password", 3, 1)
         client._mail = MagicMock()
-        header_bytes = b"From: test@example.com\r\nSubject: Test\r\n"
-        client._mail.fetch.return_value = ("OK", [header_bytes])
+        client._mail.fetch.return_value = ("OK", [HEADER_BYTES])
 
         result = client.fetch_headers(b"1")
         self.assertIsNotNone(result)
@@ -545,8 +545,7 @@ class TestIMAPClient(unittest.TestCase):
         """Test IMAPClient.fetch_message with string response."""
         client = IMAPClient("imap.example.com", "user", "password", 3, 1)
         client._mail = MagicMock()
-        msg_bytes = b"From: test@example.com\r\n\r\nBody"
-        client._mail.fetch.return_value = ("OK", [msg_bytes])
+        client._mail.fetch.return_value = ("OK", [MSG_BYTES])
 
         result = client.fetch_message(b"1")
         self.assertIsNotNone(result)
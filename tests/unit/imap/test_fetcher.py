@@ -1,5 +1,6 @@
 """Tests for email processor module."""
 
+import imaplib
 import shutil
 import tempfile
 import unittest
@@ -9,10 +10,20 @@ from unittest.mock import MagicMock, patch
 
 from email_processor.imap.fetcher import (
     Fetcher,
+    ProcessingMetrics,
     ProcessingResult,
     get_start_date,
 )
 from email_processor.logging.setup import setup_logging
+from tests.unit.imap.test_fetcher_base import (
+    HEADER_FETCH_RESPONSES,
+    INVOICE_MSG_BYTES,
+    INVOICE_PDF_BYTES,
+    OTHER_SENDER_HEADER_BYTES,
+    TEST_HEADER_BYTES,
+    UID_RESPONSE,
+    make_imap_stub,
+)
 
 # Backward compatibility alias
 EmailProcessor = Fetcher
@@ -94,9 +105,7 @@ class TestEmailProcessor(unittest.TestCase):
     def test_process_no_emails(self, mock_imap_connect, mock_get_password):
         """Test processing with no emails."""
         mock_get_password.return_value = "password"
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
-        mock_mail.search.return_value = ("OK", [b""])  # No messages
+        mock_mail = make_imap_stub()  # No messages
         mock_imap_connect.return_value = mock_mail
 
         processor = EmailProcessor(self.config)
@@ -106,6 +115,25 @@ class TestEmailProcessor(unittest.TestCase):
         self.assertEqual(result.skipped, 0)
         self.assertEqual(result.errors, 0)
 
+    @patch("email_processor.imap.fetcher.get_imap_password")
+    @patch("email_processor.imap.fetcher.imap_connect")
+    def test_process_reuses_password(self, mock_imap_connect, mock_get_password):
+        """Test the password is looked up once per processor and again after a rejected login."""
+        mock_get_password.return_value = "password"
+        mock_mail = make_imap_stub()
+        mock_imap_connect.return_value = mock_mail
+
+        processor = EmailProcessor(self.config)
+        processor.process(dry_run=False)
+        processor.process(dry_run=False)
+        self.assertEqual(mock_get_password.call_count, 1)
+
+        mock_imap_connect.side_effect = ConnectionError("IMAP authentication failed")
+        processor.process(dry_run=False)
+        mock_imap_connect.side_effect = None
+        processor.process(dry_run=False)
+        self.assertEqual(mock_get_password.call_count, 2)
+
     @patch("email_processor.imap.fetcher.get_imap_password")
     def test_process_password_error(self, mock_get_password):
         """Test processing with password error."""
@@ -215,7 +243,7 @@ class TestEmailProcessor(unittest.TestCase):
     def test_process_inbox_select_failed(self, mock_imap_connect, mock_get_password):
         """Test processing when INBOX select fails."""
         mock_get_password.return_value = "password"
-        mock_mail = MagicMock()
+        mock_mail = make_imap_stub()
         mock_mail.select.return_value = ("NO", [b"Select failed"])
         mock_imap_connect.return_value = mock_mail
 
@@ -230,10 +258,8 @@ class TestEmailProcessor(unittest.TestCase):
     @patch("email_processor.imap.fetcher.imap_connect")
     def test_process_inbox_select_imap_error(self, mock_imap_connect, mock_get_password):
         """Test processing when INBOX select raises IMAP4.error."""
-        import imaplib
-
         mock_get_password.return_value = "password"
-        mock_mail = MagicMock()
+        mock_mail = make_imap_stub()
         mock_mail.select.side_effect = imaplib.IMAP4.error("IMAP error")
         mock_imap_connect.return_value = mock_mail
 
@@ -251,7 +277,7 @@ class TestEmailProcessor(unittest.TestCase):
     ):
         """Test processing when INBOX select raises AttributeError."""
         mock_get_password.return_value = "password"
-        mock_mail = MagicMock()
+        mock_mail = make_imap_stub()
         mock_mail.select.side_effect = AttributeError("Invalid state")
         mock_imap_connect.return_value = mock_mail
 
@@ -269,7 +295,7 @@ class TestEmailProcessor(unittest.TestCase):
     ):
         """Test processing when INBOX select raises TypeError."""
         mock_get_password.return_value = "password"
-        mock_mail = MagicMock()
+        mock_mail = make_imap_stub()
         mock_mail.select.side_effect = TypeError("Invalid state")
         mock_imap_connect.return_value = mock_mail
 
@@ -285,7 +311,7 @@ class TestEmailProcessor(unittest.TestCase):
     def test_process_inbox_select_unexpected_error(self, mock_imap_connect, mock_get_password):
         """Test processing when INBOX select raises unexpected error."""
         mock_get_password.return_value = "password"
-        mock_mail = MagicMock()
+        mock_mail = make_imap_stub()
         mock_mail.select.side_effect = ValueError("Unexpected error")
         mock_imap_connect.return_value = mock_mail
 
@@ -301,8 +327,7 @@ class TestEmailProcessor(unittest.TestCase):
     def test_process_search_error(self, mock_imap_connect, mock_get_password):
         """Test processing when search fails."""
         mock_get_password.return_value = "password"
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
+        mock_mail = make_imap_stub()
         mock_mail.search.return_value = ("NO", [b"Search failed"])
         mock_imap_connect.return_value = mock_mail
 
@@ -317,11 +342,8 @@ class TestEmailProcessor(unittest.TestCase):
     @patch("email_processor.imap.fetcher.imap_connect")
     def test_process_search_imap_error(self, mock_imap_connect, mock_get_password):
         """Test processing when search raises IMAP4.error."""
-        import imaplib
-
         mock_get_password.return_value = "password"
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
+        mock_mail = make_imap_stub()
         mock_mail.search.side_effect = imaplib.IMAP4.error("IMAP search error")
         mock_imap_connect.return_value = mock_mail
 
@@ -339,8 +361,7 @@ class TestEmailProcessor(unittest.TestCase):
     ):
         """Test processing when search raises AttributeError."""
         mock_get_password.return_value = "password"
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
+        mock_mail = make_imap_stub()
         mock_mail.search.side_effect = AttributeError("Invalid state")
         mock_imap_connect.return_value = mock_mail
 
@@ -356,8 +377,7 @@ class TestEmailProcessor(unittest.TestCase):
     def test_process_search_invalid_state_type_error(self, mock_imap_connect, mock_get_password):
         """Test processing when search raises TypeError."""
         mock_get_password.return_value = "password"
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
+        mock_mail = make_imap_stub()
         mock_mail.search.side_effect = TypeError("Invalid state")
         mock_imap_connect.return_value = mock_mail
 
@@ -373,8 +393,7 @@ class TestEmailProcessor(unittest.TestCase):
     def test_process_search_unexpected_error(self, mock_imap_connect, mock_get_password):
         """Test processing when search raises unexpected error."""
         mock_get_password.return_value = "password"
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
+        mock_mail = make_imap_stub()
         mock_mail.search.side_effect = ValueError("Unexpected error")
         mock_imap_connect.return_value = mock_mail
 
@@ -390,9 +409,7 @@ class TestEmailProcessor(unittest.TestCase):
     def test_process_dry_run(self, mock_imap_connect, mock_get_password):
         """Test processing in dry-run mode."""
         mock_get_password.return_value = "password"
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
-        mock_mail.search.return_value = ("OK", [b""])  # No messages
+        mock_mail = make_imap_stub()  # No messages
         mock_imap_connect.return_value = mock_mail
 
         processor = EmailProcessor(self.config)
@@ -407,9 +424,7 @@ class TestEmailProcessor(unittest.TestCase):
     def test_process_cleanup_error(self, mock_imap_connect, mock_get_password):
         """Test processing when cleanup fails."""
         mock_get_password.return_value = "password"
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
-        mock_mail.search.return_value = ("OK", [b""])
+        mock_mail = make_imap_stub()
         mock_imap_connect.return_value = mock_mail
 
         with patch(
@@ -460,152 +475,93 @@ class TestProcessEmail(unittest.TestCase):
 
     def test_process_email_uid_fetch_failed(self):
         """Test _process_email when UID fetch fails."""
-        mock_mail = MagicMock()
+        mock_mail = make_imap_stub()
         mock_mail.fetch.return_value = ("NO", None)
 
-        from email_processor.imap.fetcher import ProcessingMetrics
-
         metrics = ProcessingMetrics()
         result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-        self.assertEqual(result, "skipped")
-        self.assertEqual(blocked, 0)
+        self.assertEqual((result, blocked), ("skipped", 0))
 
     def test_process_email_uid_extraction_failed(self):
         """Test _process_email when UID extraction fails."""
-        mock_mail = MagicMock()
+        mock_mail = make_imap_stub()
         mock_mail.fetch.return_value = ("OK", [(b"No UID here", None)])
 
-        from email_processor.imap.fetcher import ProcessingMetrics
-
         metrics = ProcessingMetrics()
         result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-        self.assertEqual(result, "skipped")
-        self.assertEqual(blocked, 0)
+        self.assertEqual((result, blocked), ("skipped", 0))
 
     def test_process_email_header_fetch_failed(self):
         """Test _process_email when header fetch fails."""
-        mock_mail = MagicMock()
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),  # UID fetch succeeds
+        mock_mail = make_imap_stub()
+        mock_mail.fetch.side_effect = (
+            UID_RESPONSE,  # UID fetch succeeds
             ("NO", None),  # Header fetch fails
-        ]
-
-        from email_processor.imap.fetcher import ProcessingMetrics
+        )
 
         metrics = ProcessingMetrics()
         result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-        self.assertEqual(result, "skipped")
-        self.assertEqual(blocked, 0)
+        self.assertEqual((result, blocked), ("skipped", 0))
 
     def test_process_email_already_processed(self):
         """Test _process_email when email already processed."""
         from email_processor.storage.uid_storage import save_processed_uid_for_day
 
-        mock_mail = MagicMock()
-        header_bytes = (
-            b"From: sender@example.com\r\nSubject: Test\r\nDate: Mon, 1 Jan 2024 12:00:00 +0000\r\n"
+        mock_mail = make_imap_stub()
+        mock_mail.fetch.side_effect = (
+            UID_RESPONSE,
+            ("OK", [(None, TEST_HEADER_BYTES)]),
         )
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [(None, header_bytes)]),
-        ]
 
         # Mark as processed
         day_str = "2024-01-01"
         cache = {}
         save_processed_uid_for_day(self.processor.processed_dir, day_str, "123", cache)
 
-        from email_processor.imap.fetcher import ProcessingMetrics
-
         metrics = ProcessingMetrics()
         result, blocked = self.processor._process_email(mock_mail, b"1", cache, False, metrics)
-        self.assertEqual(result, "skipped")
-        self.assertEqual(blocked, 0)
+        self.assertEqual((result, blocked), ("skipped", 0))
 
     def test_process_email_sender_not_allowed(self):
         """Test _process_email when sender is not allowed."""
-        mock_mail = MagicMock()
-        header_bytes = (
-            b"From: other@example.com\r\nSubject: Test\r\nDate: Mon, 1 Jan 2024 12:00:00 +0000\r\n"
+        mock_mail = make_imap_stub()
+        mock_mail.fetch.side_effect = (
+            UID_RESPONSE,
+            ("OK", [(None, OTHER_SENDER_HEADER_BYTES)]),
         )
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [(None, header_bytes)]),
-        ]
-
-        from email_processor.imap.fetcher import ProcessingMetrics
 
         metrics = ProcessingMetrics()
         result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-        self.assertEqual(result, "skipped")
-        self.assertEqual(blocked, 0)
+        self.assertEqual((result, blocked), ("skipped", 0))
 
     def test_process_email_message_fetch_failed(self):
         """Test _process_email when message fetch fails."""
-        mock_mail = MagicMock()
-        header_bytes = b"From: sender@example.com\r\nSubject: Invoice\r\nDate: Mon, 1 Jan 2024 12:00:00 +0000\r\n"
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [(None, header_bytes)]),
+        mock_mail = make_imap_stub()
+        mock_mail.fetch.side_effect = (
+            *HEADER_FETCH_RESPONSES,
             ("NO", None),  # Message fetch fails
-        ]
-
-        from email_processor.imap.fetcher import ProcessingMetrics
+        )
 
         metrics = ProcessingMetrics()
         result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-        self.assertEqual(result, "skipped")
-        self.assertEqual(blocked, 0)
+        self.assertEqual((result, blocked), ("skipped", 0))
 
     def test_process_email_no_attachments(self):
         """Test _process_email when email has no attachments."""
-        mock_mail = MagicMock()
-        header_bytes = b"From: sender@example.com\r\nSubject: Invoice\r\nDate: Mon, 1 Jan 2024 12:00:00 +0000\r\n"
-        msg_bytes = b"From: sender@example.com\r\nSubject: Invoice\r\n\r\nBody text"
-        msg = message_from_bytes(msg_bytes)
-
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [(None, header_bytes)]),
-            ("OK", [(None, msg_bytes)]),
-        ]
+        mock_mail = make_imap_stub()
+        msg = message_from_bytes(INVOICE_MSG_BYTES)
 
-        from email_processor.imap.fetcher import ProcessingMetrics
+        mock_mail.fetch.side_effect = (*HEADER_FETCH_RESPONSES, ("OK", [(None, INVOICE_MSG_BYTES)]))
 
         metrics = ProcessingMetrics()
         result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-        self.assertEqual(result, "skipped")
-        self.assertEqual(blocked, 0)
+        self.assertEqual((result, blocked), ("skipped", 0))
 
     def test_process_email_with_attachment(self):
         """Test _process_email with attachment."""
-        mock_mail = MagicMock()
-        header_bytes = b"From: sender@example.com\r\nSubject: Invoice\r\nDate: Mon, 1 Jan 2024 12:00:00 +0000\r\n"
+        mock_mail = make_imap_stub()
 
-        # Create message with attachment using MIMEMultipart
-        from email.mime.base import MIMEBase
-        from email.mime.multipart import MIMEMultipart
-
-        from email_processor.imap.fetcher import ProcessingMetrics
-
-        msg = MIMEMultipart()
-        msg["From"] = "sender@example.com"
-        msg["Subject"] = "Invoice"
-        msg["Date"] = "Mon, 1 Jan 2024 12:00:00 +0000"
-
-        # Add attachment
-        part = MIMEBase("application", "octet-stream")
-        part.set_payload(b"test content")
-        part.add_header("Content-Disposition", "attachment", filename="test.pdf")
-        msg.attach(part)
-
-        msg_bytes = msg.as_bytes()
-
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [(None, header_bytes)]),
-            ("OK", [(None, msg_bytes)]),
-        ]
+        mock_mail.fetch.side_effect = (*HEADER_FETCH_RESPONSES, ("OK", [(None, INVOICE_PDF_BYTES)]))
 
         metrics = ProcessingMetrics()
         result = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
@@ -620,8 +576,6 @@ class TestProcessingResult(unittest.TestCase):
 
     def test_processing_result(self):
         """Test ProcessingResult dataclass."""
-        from email_processor.imap.fetcher import ProcessingMetrics
-
         metrics = ProcessingMetrics()
         result = ProcessingResult(
             processed=5, skipped=3, errors=1, file_stats={".pdf": 3, ".doc": 2}, metrics=metrics
@@ -670,9 +624,7 @@ class TestProgressBar(unittest.TestCase):
     def test_process_with_progress_bar(self, mock_imap_connect, mock_get_password):
         """Test process with progress bar enabled."""
         mock_get_password.return_value = "password"
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
-        mock_mail.search.return_value = ("OK", [b"1 2 3"])
+        mock_mail = make_imap_stub(search_ids=b"1 2 3")
         mock_mail.fetch.return_value = ("OK", [(b"UID 123", None)])
         mock_mail.logout.return_value = ("OK", [])
         mock_imap_connect.return_value = mock_mail
@@ -701,9 +653,7 @@ class TestProgressBar(unittest.TestCase):
     def test_process_without_progress_bar(self, mock_imap_connect, mock_get_password):
         """Test process with progress bar disabled."""
         mock_get_password.return_value = "password"
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
-        mock_mail.search.return_value = ("OK", [b"1 2 3"])
+        mock_mail = make_imap_stub(search_ids=b"1 2 3")
         mock_mail.fetch.return_value = ("OK", [(b"UID 123", None)])
         mock_mail.logout.return_value = ("OK", [])
         mock_imap_connect.return_value = mock_mail
@@ -1,10 +1,19 @@
 """Tests for Fetcher archive functionality."""
 
 import imaplib
-from unittest.mock import MagicMock, patch
-
-from email_processor.imap.fetcher import Fetcher
-from tests.unit.imap.test_fetcher_base import TestFetcherBase
+from unittest.mock import Mock, call, patch
+
+from email_processor.imap import fetcher as fetcher_module
+from email_processor.imap.fetcher import Fetcher, ProcessingMetrics
+from tests.unit.imap.test_fetcher_base import (
+    HEADER_FETCH_RESPONSES,
+    INVOICE_HEADER_BYTES,
+    INVOICE_MSG_BYTES,
+    TEST_HEADER_BYTES,
+    UID_RESPONSE,
+    TestFetcherBase,
+    make_imap_stub,
+)
 
 # Backward compatibility alias
 EmailProcessor = Fetcher
@@ -13,67 +22,30 @@ EmailProcessor = Fetcher
 class TestFetcherArchive(TestFetcherBase):
     """Tests for Fetcher archive functionality."""
 
-    def test_process_email_archive_error(self):
-        """Test _process_email when archiving fails."""
-        mock_mail = MagicMock()
-        header_bytes = b"From: sender@example.com\r\nSubject: Invoice\r\nDate: Mon, 1 Jan 2024 12:00:00 +0000\r\n"
-        msg_bytes = b"From: sender@example.com\r\nSubject: Invoice\r\n\r\nBody"
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [(None, header_bytes)]),
-            ("OK", [(None, msg_bytes)]),
-        ]
-
-        with patch(
-            "email_processor.imap.fetcher.archive_message",
-            side_effect=Exception("Archive error"),
-        ):
-            from email_processor.imap.fetcher import ProcessingMetrics
-
-            metrics = ProcessingMetrics()
-            result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-            # Should still return "skipped" (no attachments)
-            self.assertEqual(result, "skipped")
-            self.assertEqual(blocked, 0)
-
     def test_process_email_archive_only_mapped_false(self):
         """Test _process_email when archive_only_mapped is False."""
         config = self.config.copy()
         config["processing"]["archive_only_mapped"] = False
         processor = EmailProcessor(config)
 
-        mock_mail = MagicMock()
-        header_bytes = (
-            b"From: sender@example.com\r\nSubject: Test\r\nDate: Mon, 1 Jan 2024 12:00:00 +0000\r\n"
-        )
         msg_bytes = b"From: sender@example.com\r\nSubject: Test\r\n\r\nBody"
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [(None, header_bytes)]),
-            ("OK", [(None, msg_bytes)]),
-        ]
-
-        from email_processor.imap.fetcher import ProcessingMetrics
+        mock_mail = make_imap_stub(
+            (
+                UID_RESPONSE,
+                ("OK", [(None, TEST_HEADER_BYTES)]),
+                ("OK", [(None, msg_bytes)]),
+            )
+        )
 
         metrics = ProcessingMetrics()
         result, blocked = processor._process_email(mock_mail, b"1", {}, False, metrics)
         # Should not archive when archive_only_mapped is False and no mapped folder
-        self.assertEqual(result, "skipped")
-        self.assertEqual(blocked, 0)
+        self.assertEqual((result, blocked), ("skipped", 0))
 
     def test_process_email_dry_run_archive(self):
         """Test _process_email when archiving in dry-run mode."""
-        mock_mail = MagicMock()
-        header_bytes = b"From: sender@example.com\r\nSubject: Invoice\r\nDate: Mon, 1 Jan 2024 12:00:00 +0000\r\n"
-        msg_bytes = b"From: sender@example.com\r\nSubject: Invoice\r\n\r\nBody text"
-
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [(None, header_bytes)]),
-            ("OK", [(None, msg_bytes)]),
-        ]
 
-        from email_processor.imap.fetcher import ProcessingMetrics
+        mock_mail = make_imap_stub((*HEADER_FETCH_RESPONSES, ("OK", [(None, INVOICE_MSG_BYTES)])))
 
         metrics = ProcessingMetrics()
         # Set archive_only_mapped to True and use mapped folder
@@ -82,83 +54,109 @@ class TestFetcherArchive(TestFetcherBase):
             mock_mail, b"1", {}, True, metrics
         )  # dry_run=True
         # Should log dry_run_archive but not actually archive
-        self.assertEqual(result, "skipped")
-        self.assertEqual(blocked, 0)
-
-    def test_process_email_archive_connection_error(self):
-        """Test _process_email when archive raises ConnectionError."""
-        mock_mail = MagicMock()
-        header_bytes = b"From: sender@example.com\r\nSubject: Invoice\r\nDate: Mon, 1 Jan 2024 12:00:00 +0000\r\n"
-        msg_bytes = b"From: sender@example.com\r\nSubject: Invoice\r\n\r\nBody text"
-
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [(None, header_bytes)]),
-            ("OK", [(None, msg_bytes)]),
-        ]
-
-        from email_processor.imap.fetcher import ProcessingMetrics
-
-        # Mock archive_message to raise ConnectionError
-        with patch(
-            "email_processor.imap.fetcher.archive_message",
-            side_effect=ConnectionError("Connection lost"),
+        self.assertEqual((result, blocked), ("skipped", 0))
+
+    @patch.object(fetcher_module, "archive_message")
+    def test_process_email_archive_errors(self, mock_archive):
+        """Test _process_email when archiving the message raises."""
+        self.processor.archive_only_mapped = True
+        for uid, exc in enumerate(
+            (
+                ConnectionError("Connection lost"),
+                OSError("File system error"),
+                imaplib.IMAP4.error("IMAP archive error"),
+                Exception("Archive error"),
+            ),
+            start=200,
         ):
-            metrics = ProcessingMetrics()
-            self.processor.archive_only_mapped = True
-            result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-            # Should handle archive error gracefully
-            self.assertEqual(result, "skipped")
-            self.assertEqual(blocked, 0)
-
-    def test_process_email_archive_os_error(self):
-        """Test _process_email when archive raises OSError."""
-        mock_mail = MagicMock()
-        header_bytes = b"From: sender@example.com\r\nSubject: Invoice\r\nDate: Mon, 1 Jan 2024 12:00:00 +0000\r\n"
-        msg_bytes = b"From: sender@example.com\r\nSubject: Invoice\r\n\r\nBody text"
-
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [(None, header_bytes)]),
-            ("OK", [(None, msg_bytes)]),
-        ]
-
-        from email_processor.imap.fetcher import ProcessingMetrics
-
-        # Mock archive_message to raise OSError
-        with patch(
-            "email_processor.imap.fetcher.archive_message",
-            side_effect=OSError("File system error"),
+            with self.subTest(exc=type(exc).__name__):
+                mock_mail = Mock()
+                mock_mail.fetch.return_value = ("OK", [(None, INVOICE_MSG_BYTES)])
+                mock_archive.reset_mock()
+                mock_archive.side_effect = exc
+
+                # A distinct UID per case so the previous case's saved UID is not skipped
+                # Should handle archive error gracefully (no attachments)
+                self._assert_process_email_result(
+                    mock_mail, "skipped", prefetched=(str(uid), INVOICE_HEADER_BYTES)
+                )
+                mock_archive.assert_called_once_with(mock_mail, str(uid), "INBOX/Processed")
+
+    def test_process_email_queues_archive(self):
+        """Test _process_email queues the UID instead of archiving when given a queue."""
+        mock_mail = make_imap_stub((("OK", [(None, INVOICE_MSG_BYTES)]),))
+
+        archive_queue: list[str] = []
+        with patch.object(fetcher_module, "archive_message") as mock_archive:
+            result, _ = self.processor._process_email(
+                mock_mail,
+                b"1",
+                {},
+                False,
+                ProcessingMetrics(),
+                ("123", INVOICE_HEADER_BYTES),
+                archive_queue,
+            )
+        self.assertEqual(result, "skipped")
+        self.assertEqual(archive_queue, ["123"])
+        mock_archive.assert_not_called()
+
+    def test_process_archives_queue_per_batch(self):
+        """Test process() archives queued UIDs in bulk per header batch, even after a failure."""
+        self.config["processing"]["fetch_batch_size"] = 2
+        self.config["processing"]["show_progress"] = False
+        processor = EmailProcessor(self.config)
+
+        def queue_uid(mail, msg_id, cache, dry_run, metrics, prefetched, archive_queue):
+            archive_queue.append(f"1{msg_id.decode()}")
+            return ("processed", 0)
+
+        for name, archive_side_effect in (
+            ("success", None),
+            ("first_batch_fails", [imaplib.IMAP4.error("Copy error"), None]),
         ):
-            metrics = ProcessingMetrics()
-            self.processor.archive_only_mapped = True
-            result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-            # Should handle archive error gracefully
-            self.assertEqual(result, "skipped")
-            self.assertEqual(blocked, 0)
-
-    def test_process_email_archive_imap_error(self):
-        """Test _process_email when archive raises IMAP4.error."""
-        mock_mail = MagicMock()
-        header_bytes = b"From: sender@example.com\r\nSubject: Invoice\r\nDate: Mon, 1 Jan 2024 12:00:00 +0000\r\n"
-        msg_bytes = b"From: sender@example.com\r\nSubject: Invoice\r\n\r\nBody text"
-
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [(None, header_bytes)]),
-            ("OK", [(None, msg_bytes)]),
-        ]
-
-        from email_processor.imap.fetcher import ProcessingMetrics
-
-        # Mock archive_message to raise imaplib.IMAP4.error
-        with patch(
-            "email_processor.imap.fetcher.archive_message",
-            side_effect=imaplib.IMAP4.error("IMAP archive error"),
+            with self.subTest(case=name):
+                mock_mail = make_imap_stub(search_ids=b"1 2 3")
+                mock_mail.select.return_value = ("OK", [b"3"])
+                mock_mail.fetch.return_value = ("NO", [b"error"])
+
+                with (
+                    patch.object(fetcher_module, "get_imap_password", return_value="password"),
+                    patch.object(fetcher_module, "imap_connect", return_value=mock_mail),
+                    patch.object(processor, "_process_email", side_effect=queue_uid),
+                    patch.object(
+                        fetcher_module, "archive_messages", side_effect=archive_side_effect
+                    ) as mock_archive,
+                ):
+                    result = processor.process()
+
+                # A failed bulk archive does not abort processing of later batches
+                self.assertEqual(result.processed, 3)
+                self.assertEqual(
+                    mock_archive.call_args_list,
+                    [
+                        call(mock_mail, ["13", "12"], "INBOX/Processed"),
+                        call(mock_mail, ["11"], "INBOX/Processed"),
+                    ],
+                )
+
+    def test_flush_archive_queue_errors(self):
+        """Test archive errors are logged by type and the queue is still emptied."""
+        for exc, event in (
+            (imaplib.IMAP4.error("IMAP error"), "archive_imap_error"),
+            (ConnectionError("Connection lost"), "archive_connection_error"),
+            (OSError("Socket closed"), "archive_connection_error"),
+            (RuntimeError("Unexpected"), "archive_unexpected_error"),
         ):
-            metrics = ProcessingMetrics()
-            self.processor.archive_only_mapped = True
-            result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-            # Should handle archive error gracefully
-            self.assertEqual(result, "skipped")
-            self.assertEqual(blocked, 0)
+            with self.subTest(event=event, error_type=type(exc).__name__):
+                archive_queue = ["101", "102"]
+                with (
+                    patch.object(fetcher_module, "archive_messages", side_effect=exc),
+                    patch.object(self.processor, "logger") as mock_logger,
+                ):
+                    self.processor._flush_archive_queue(Mock(), archive_queue)
+
+                self.assertEqual(archive_queue, [])
+                mock_logger.error.assert_called_once_with(
+                    event, error=str(exc), error_type=type(exc).__name__
+                )
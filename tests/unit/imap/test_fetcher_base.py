@@ -1,24 +1,117 @@
 """Base test class for Fetcher tests with common setup."""
 
-import shutil
 import tempfile
 import unittest
+from base64 import b64encode
 from pathlib import Path
+from typing import Any, Optional
+from unittest.mock import Mock
 
-from email_processor.imap.fetcher import Fetcher
+from email_processor.imap.fetcher import Fetcher, ProcessingMetrics
 from email_processor.logging.setup import setup_logging
 
 # Backward compatibility alias
 EmailProcessor = Fetcher
 
+# Canned IMAP payloads shared by the _process_email tests
+UID_RESPONSE = ("OK", [(b"UID 123 SIZE 1000", None)])
+INVOICE_HEADER_BYTES = (
+    b"From: sender@example.com\r\nSubject: Invoice\r\nDate: Mon, 1 Jan 2024 12:00:00 +0000\r\n"
+)
+TEST_HEADER_BYTES = (
+    b"From: sender@example.com\r\nSubject: Test\r\nDate: Mon, 1 Jan 2024 12:00:00 +0000\r\n"
+)
+OTHER_SENDER_HEADER_BYTES = (
+    b"From: other@example.com\r\nSubject: Test\r\nDate: Mon, 1 Jan 2024 12:00:00 +0000\r\n"
+)
+INVOICE_MSG_BYTES = b"From: sender@example.com\r\nSubject: Invoice\r\n\r\nBody"
+# fetch() replies up to the header, and up to the full message, for UID 123
+HEADER_FETCH_RESPONSES = (UID_RESPONSE, ("OK", [(None, INVOICE_HEADER_BYTES)]))
+MESSAGE_FETCH_RESPONSES = (*HEADER_FETCH_RESPONSES, ("OK", [(None, INVOICE_MSG_BYTES)]))
+
+
+INVOICE_BOUNDARY = b"===INVOICE-BOUNDARY=="
+
+
+def _build_invoice_bytes(
+    subtype: str = "pdf",
+    filename: Optional[str] = "test.pdf",
+    payload: bytes = b"test content",
+    base64: bool = False,
+) -> bytes:
+    """Build a raw invoice message with a single attachment and a fixed boundary."""
+    disposition = b"attachment"
+    if filename:
+        disposition += b'; filename="' + filename.encode() + b'"'
+    part_headers = b"Content-Type: application/" + subtype.encode() + b"\r\n"
+    if base64:
+        part_headers += b"Content-Transfer-Encoding: base64\r\n"
+        payload = b64encode(payload)
+    part_headers += b"Content-Disposition: " + disposition + b"\r\n"
+    return (
+        b'Content-Type: multipart/mixed; boundary="' + INVOICE_BOUNDARY + b'"\r\n'
+        b"MIME-Version: 1.0\r\n"
+        b"From: sender@example.com\r\n"
+        b"Subject: Invoice\r\n"
+        b"Date: Mon, 1 Jan 2024 12:00:00 +0000\r\n"
+        b"\r\n"
+        b"--" + INVOICE_BOUNDARY + b"\r\n" + part_headers + b"\r\n" + payload + b"\r\n"
+        b"--" + INVOICE_BOUNDARY + b"--\r\n"
+    )
+
+
+# Built once at import; the tests only read them
+INVOICE_PDF_BYTES = _build_invoice_bytes()
+INVOICE_PDF_BASE64_BYTES = _build_invoice_bytes(payload=b"test pdf content", base64=True)
+INVOICE_EXE_BYTES = _build_invoice_bytes(subtype="exe", filename="malware.exe")
+INVOICE_NO_FILENAME_BYTES = _build_invoice_bytes(filename=None)
+
+
+# IMAP4 commands the fetcher and archive code call on a connection
+IMAP_COMMANDS = ("fetch", "select", "search", "uid", "create", "expunge", "logout")
+
+
+def make_imap_stub(fetch_side_effect: Any = None, search_ids: bytes = b"") -> Mock:
+    """Return a spec_set Mock connection: select() is OK and search() yields search_ids."""
+    mail = Mock(spec_set=IMAP_COMMANDS)
+    mail.select.return_value = ("OK", [b"1"])
+    mail.search.return_value = ("OK", [search_ids])
+    mail.fetch.side_effect = fetch_side_effect
+    return mail
+
+
+class RaisingItems:
+    """Fetch payload stand-in whose indexing raises the given exception."""
+
+    __slots__ = ("exc",)
+
+    def __init__(self, exc: Exception):
+        self.exc = exc
+
+    def __getitem__(self, key):
+        raise self.exc
+
 
 class TestFetcherBase(unittest.TestCase):
     """Base test class for Fetcher tests with common setup."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Create one temporary root shared by all tests in the class."""
+        cls._temp_root = tempfile.TemporaryDirectory()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared temporary root."""
+        cls._temp_root.cleanup()
+
     def setUp(self):
         """Setup test fixtures."""
         setup_logging({"level": "INFO", "format": "console"})
-        self.temp_dir = tempfile.mkdtemp()
+        # Each test gets its own subdirectory; removed with the class root
+        temp_dir = Path(self._temp_root.name) / self._testMethodName
+        temp_dir.mkdir()
+        self.temp_dir = str(temp_dir)
 
         self.config = {
             "imap": {
@@ -48,6 +141,10 @@ class TestFetcherBase(unittest.TestCase):
         }
         self.processor = EmailProcessor(self.config)
 
-    def tearDown(self):
-        """Clean up test fixtures."""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    def _assert_process_email_result(self, mock_mail, expected="error", prefetched=None):
+        """Run _process_email for message b"1" and check its result with no blocked files."""
+        metrics = ProcessingMetrics()
+        self.assertEqual(
+            self.processor._process_email(mock_mail, b"1", {}, False, metrics, prefetched),
+            (expected, 0),
+        )
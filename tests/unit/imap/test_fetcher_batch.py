@@ -0,0 +1,136 @@
+"""Tests for Fetcher batched UID and header fetching."""
+
+import imaplib
+from unittest.mock import patch
+
+from email_processor.imap import fetcher as fetcher_module
+from email_processor.imap.fetcher import ProcessingMetrics
+from email_processor.imap.mock_client import MockIMAP4_SSL
+from tests.unit.imap.test_fetcher_base import EmailProcessor, TestFetcherBase, make_imap_stub
+
+HEADER_1 = b"From: sender@example.com\r\nSubject: Invoice 1\r\n\r\n"
+HEADER_2 = b"From: other@example.com\r\nSubject: Report\r\n\r\n"
+
+
+class TestFetcherBatch(TestFetcherBase):
+    """Tests for Fetcher batched UID and header fetching."""
+
+    def test_prefetch_headers_parses_multiple_messages(self):
+        """Test that one FETCH response is split into per-message UID and headers."""
+        mock_mail = make_imap_stub()
+        mock_mail.fetch.return_value = (
+            "OK",
+            [
+                (b"1 (UID 101 BODY[HEADER.FIELDS (FROM SUBJECT DATE)] {48}", HEADER_1),
+                b")",
+                (b"2 (UID 102 BODY[HEADER.FIELDS (FROM SUBJECT DATE)] {44}", HEADER_2),
+                b")",
+            ],
+        )
+        metrics = ProcessingMetrics()
+
+        prefetched = self.processor._prefetch_headers(mock_mail, [b"1", b"2"], metrics)
+
+        self.assertEqual(prefetched, {b"1": ("101", HEADER_1), b"2": ("102", HEADER_2)})
+        mock_mail.fetch.assert_called_once_with(
+            b"1,2", "(UID BODY.PEEK[HEADER.FIELDS (FROM SUBJECT DATE)])"
+        )
+        self.assertEqual(metrics.imap_operations, 1)
+
+    def test_prefetch_headers_uid_after_literal(self):
+        """Test that a UID sent after the header literal is still picked up."""
+        mock_mail = make_imap_stub()
+        mock_mail.fetch.return_value = (
+            "OK",
+            [(b"1 (BODY[HEADER.FIELDS (FROM SUBJECT DATE)] {48}", HEADER_1), b" UID 101)"],
+        )
+
+        prefetched = self.processor._prefetch_headers(mock_mail, [b"1"], ProcessingMetrics())
+
+        self.assertEqual(prefetched, {b"1": ("101", HEADER_1)})
+
+    def test_prefetch_headers_interleaved_response_not_continuation(self):
+        """Test that a bare FETCH line for another message does not lend its UID."""
+        mock_mail = make_imap_stub()
+        mock_mail.fetch.return_value = (
+            "OK",
+            [
+                (b"1 (BODY[HEADER.FIELDS (FROM SUBJECT DATE)] {48}", HEADER_1),
+                b")",
+                b"3 (FLAGS (\\Seen) UID 303)",
+                (b"2 (BODY[HEADER.FIELDS (FROM SUBJECT DATE)] {44}", HEADER_2),
+                b" UID 102)",
+            ],
+        )
+
+        prefetched = self.processor._prefetch_headers(mock_mail, [b"1", b"2"], ProcessingMetrics())
+
+        # Message 1 has no UID of its own and is left to the per-message fetch
+        self.assertEqual(prefetched, {b"2": ("102", HEADER_2)})
+
+    def test_prefetch_headers_failures_return_empty(self):
+        """Test that failed or unusable batch responses fall back to per-message fetches."""
+        cases = {
+            "imap_error": {"side_effect": imaplib.IMAP4.error("boom")},
+            "status_no": {"return_value": ("NO", [b"error"])},
+            "no_uid": {"return_value": ("OK", [(b"1 (BODY[HEADER] {48}", HEADER_1), b")"])},
+            "empty_header": {"return_value": ("OK", [(b"1 (UID 101 BODY[HEADER] {0}", b""), b")"])},
+        }
+        for name, fetch_kwargs in cases.items():
+            with self.subTest(case=name):
+                mock_mail = make_imap_stub()
+                mock_mail.fetch.configure_mock(**fetch_kwargs)
+                prefetched = self.processor._prefetch_headers(
+                    mock_mail, [b"1"], ProcessingMetrics()
+                )
+                self.assertEqual(prefetched, {})
+
+    def test_process_email_with_prefetched_skips_uid_and_header_fetch(self):
+        """Test that prefetched UID and headers leave only the body fetch per message."""
+        mock_mail = make_imap_stub()
+        mock_mail.fetch.return_value = ("OK", [(b"1 (RFC822 {48}", HEADER_1)])
+        metrics = ProcessingMetrics()
+
+        result, blocked = self.processor._process_email(
+            mock_mail, b"1", {}, False, metrics, ("101", HEADER_1)
+        )
+
+        # No attachments in the message
+        self.assertEqual((result, blocked), ("skipped", 0))
+        mock_mail.fetch.assert_called_once_with(b"1", "(RFC822)")
+
+    def test_process_fetches_headers_in_batches(self):
+        """Test that process() issues one header FETCH per fetch_batch_size messages."""
+        self.config["processing"]["fetch_batch_size"] = 2
+        self.config["processing"]["show_progress"] = False
+        processor = EmailProcessor(self.config)
+
+        mock_mail = make_imap_stub(search_ids=b"1 2 3")
+        mock_mail.select.return_value = ("OK", [b"3"])
+        mock_mail.fetch.return_value = ("NO", [b"error"])
+
+        with (
+            patch.object(fetcher_module, "get_imap_password", return_value="password"),
+            patch.object(fetcher_module, "imap_connect", return_value=mock_mail),
+        ):
+            processor.process()
+
+        batch_calls = [
+            c.args[0] for c in mock_mail.fetch.call_args_list if c.args[1].startswith("(UID BODY")
+        ]
+        # Messages are processed newest first
+        self.assertEqual(batch_calls, [b"3,2", b"1"])
+
+    def test_process_mock_mode_uses_batched_headers(self):
+        """Test that mock mode serves batched header fetches and processes all messages."""
+        with patch.object(
+            MockIMAP4_SSL, "fetch", autospec=True, side_effect=MockIMAP4_SSL.fetch
+        ) as mock_fetch:
+            result = self.processor.process(dry_run=True, mock_mode=True)
+
+        self.assertEqual(result.processed + result.skipped + result.errors, 3)
+        self.assertEqual(result.errors, 0)
+        self.assertEqual(
+            mock_fetch.call_args_list[0].args[1:],
+            (b"3,2,1", "(UID BODY.PEEK[HEADER.FIELDS (FROM SUBJECT DATE)])"),
+        )
@@ -1,17 +1,27 @@
 """Tests for Fetcher errors functionality."""
 
 import imaplib
-from email import encoders
-from email.mime.base import MIMEBase
-from email.mime.multipart import MIMEMultipart
-from unittest.mock import MagicMock, patch
-
-from email_processor.imap.fetcher import Fetcher
-from tests.unit.imap.test_fetcher_base import TestFetcherBase
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock, patch
+
+from email_processor.imap import fetcher as fetcher_module
+from email_processor.imap.fetcher import Fetcher, ProcessingMetrics
+from tests.unit.imap.test_fetcher_base import (
+    INVOICE_HEADER_BYTES,
+    INVOICE_PDF_BASE64_BYTES,
+    OTHER_SENDER_HEADER_BYTES,
+    UID_RESPONSE,
+    TestFetcherBase,
+    make_imap_stub,
+)
 
 # Backward compatibility alias
 EmailProcessor = Fetcher
 
+# psutil memory_info() readings; only .rss is read
+MEM_INFO_LOW = SimpleNamespace(rss=1_000_000)
+MEM_INFO_HIGH = SimpleNamespace(rss=2_000_000)
+
 
 class TestFetcherErrors(TestFetcherBase):
     """Tests for Fetcher errors functionality."""
@@ -22,50 +32,35 @@ class TestFetcherErrors(TestFetcherBase):
         config["processing"]["skip_non_allowed_as_processed"] = False
         processor = EmailProcessor(config)
 
-        mock_mail = MagicMock()
-        header_bytes = (
-            b"From: other@example.com\r\nSubject: Test\r\nDate: Mon, 1 Jan 2024 12:00:00 +0000\r\n"
+        mock_mail = make_imap_stub()
+        mock_mail.fetch.side_effect = (
+            UID_RESPONSE,
+            ("OK", [(None, OTHER_SENDER_HEADER_BYTES)]),
         )
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [(None, header_bytes)]),
-        ]
-
-        from email_processor.imap.fetcher import ProcessingMetrics
 
         metrics = ProcessingMetrics()
         result, blocked = processor._process_email(mock_mail, b"1", {}, False, metrics)
-        self.assertEqual(result, "skipped")
-        self.assertEqual(blocked, 0)
+        self.assertEqual((result, blocked), ("skipped", 0))
         # Should not save UID when skip_non_allowed_as_processed is False
 
     def test_process_file_stats_with_processed(self):
         """Test file statistics when emails are processed."""
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
-        mock_mail.search.return_value = ("OK", [b"1"])
-
-        header_bytes = b"From: sender@example.com\r\nSubject: Invoice\r\nDate: Mon, 1 Jan 2024 12:00:00 +0000\r\n"
-
-        # Create message with attachment
-        msg = MIMEMultipart()
-        msg["From"] = "sender@example.com"
-        msg["Subject"] = "Invoice"
-        msg["Date"] = "Mon, 1 Jan 2024 12:00:00 +0000"
-
-        part = MIMEBase("application", "pdf")
-        part.set_payload(b"test pdf content")
-        encoders.encode_base64(part)
-        part.add_header("Content-Disposition", "attachment", filename="test.pdf")
-        msg.attach(part)
-
-        msg_bytes = msg.as_bytes()
-
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [(None, header_bytes)]),
-            ("OK", [(None, msg_bytes)]),
-        ]
+        mock_mail = make_imap_stub(search_ids=b"1")
+
+        # Batched UID + header fetch, then the full message
+        mock_mail.fetch.side_effect = (
+            (
+                "OK",
+                [
+                    (
+                        b"1 (UID 123 BODY[HEADER.FIELDS (FROM SUBJECT DATE)] {90}",
+                        INVOICE_HEADER_BYTES,
+                    ),
+                    b")",
+                ],
+            ),
+            ("OK", [(None, INVOICE_PDF_BASE64_BYTES)]),
+        )
 
         with (
             patch(
@@ -81,9 +76,7 @@ class TestFetcherErrors(TestFetcherBase):
 
     def test_process_imap_error_handling(self):
         """Test process handles IMAP errors during email processing."""
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
-        mock_mail.search.return_value = ("OK", [b"1"])
+        mock_mail = make_imap_stub(search_ids=b"1")
         mock_mail.fetch.side_effect = imaplib.IMAP4.error("IMAP error")
 
         with (
@@ -99,9 +92,7 @@ class TestFetcherErrors(TestFetcherBase):
 
     def test_process_unexpected_error_handling(self):
         """Test process handles unexpected errors during email processing."""
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
-        mock_mail.search.return_value = ("OK", [b"1"])
+        mock_mail = make_imap_stub(search_ids=b"1")
         mock_mail.fetch.side_effect = Exception("Unexpected error")
 
         with (
@@ -115,34 +106,31 @@ class TestFetcherErrors(TestFetcherBase):
             # Should handle unexpected errors
             self.assertGreaterEqual(result.errors, 0)
 
-    def test_process_logout_error(self):
-        """Test process handles logout errors."""
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
-        mock_mail.search.return_value = ("OK", [b""])
-        mock_mail.logout.side_effect = Exception("Logout error")
-
-        with (
-            patch(
-                "email_processor.imap.fetcher.get_imap_password",
-                return_value="password",
-            ),
-            patch("email_processor.imap.fetcher.imap_connect", return_value=mock_mail),
+    @patch("email_processor.imap.fetcher.imap_connect")
+    @patch("email_processor.imap.fetcher.get_imap_password", return_value="password")
+    def test_process_logout_errors(self, mock_get_password, mock_imap_connect):
+        """Test process handles errors raised by logout."""
+        for exc in (
+            Exception("Logout error"),
+            imaplib.IMAP4.error("IMAP logout error"),
+            AttributeError("No logout method"),
         ):
-            result = self.processor.process(dry_run=False)
-            # Should handle logout errors gracefully
-            self.assertIsInstance(result, type(result))
+            with self.subTest(exc=type(exc).__name__):
+                mock_mail = make_imap_stub()
+                mock_mail.logout.side_effect = exc
+                mock_imap_connect.return_value = mock_mail
+
+                result = self.processor.process(dry_run=False)
+                # Should handle logout errors gracefully
+                self.assertIsInstance(result, type(result))
+                mock_mail.logout.assert_called_once_with()
 
     @patch("email_processor.imap.fetcher.get_imap_password")
     @patch("email_processor.imap.fetcher.imap_connect")
     def test_process_email_imap_error_processing(self, mock_imap_connect, mock_get_password):
         """Test processing when _process_email raises IMAP4.error."""
-        import imaplib
-
         mock_get_password.return_value = "password"
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
-        mock_mail.search.return_value = ("OK", [b"1"])  # One email
+        mock_mail = make_imap_stub(search_ids=b"1")  # One email
         mock_imap_connect.return_value = mock_mail
 
         # Mock _process_email to raise IMAP4.error
@@ -162,9 +150,7 @@ class TestFetcherErrors(TestFetcherBase):
     ):
         """Test processing when _process_email raises ValueError."""
         mock_get_password.return_value = "password"
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
-        mock_mail.search.return_value = ("OK", [b"1"])  # One email
+        mock_mail = make_imap_stub(search_ids=b"1")  # One email
         mock_imap_connect.return_value = mock_mail
 
         # Mock _process_email to raise ValueError
@@ -180,9 +166,7 @@ class TestFetcherErrors(TestFetcherBase):
     ):
         """Test processing when _process_email raises TypeError."""
         mock_get_password.return_value = "password"
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
-        mock_mail.search.return_value = ("OK", [b"1"])  # One email
+        mock_mail = make_imap_stub(search_ids=b"1")  # One email
         mock_imap_connect.return_value = mock_mail
 
         # Mock _process_email to raise TypeError
@@ -198,9 +182,7 @@ class TestFetcherErrors(TestFetcherBase):
     ):
         """Test processing when _process_email raises AttributeError."""
         mock_get_password.return_value = "password"
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
-        mock_mail.search.return_value = ("OK", [b"1"])  # One email
+        mock_mail = make_imap_stub(search_ids=b"1")  # One email
         mock_imap_connect.return_value = mock_mail
 
         # Mock _process_email to raise AttributeError
@@ -216,9 +198,7 @@ class TestFetcherErrors(TestFetcherBase):
     def test_process_email_unexpected_error_processing(self, mock_imap_connect, mock_get_password):
         """Test processing when _process_email raises unexpected error."""
         mock_get_password.return_value = "password"
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
-        mock_mail.search.return_value = ("OK", [b"1"])  # One email
+        mock_mail = make_imap_stub(search_ids=b"1")  # One email
         mock_imap_connect.return_value = mock_mail
 
         # Mock _process_email to raise unexpected error
@@ -229,153 +209,68 @@ class TestFetcherErrors(TestFetcherBase):
             self.assertEqual(result.errors, 1)
             self.assertEqual(result.processed, 0)
 
-    def test_process_logout_imap_error(self):
-        """Test process handles IMAP logout errors."""
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
-        mock_mail.search.return_value = ("OK", [b""])
-        mock_mail.logout.side_effect = imaplib.IMAP4.error("IMAP logout error")
-
-        with (
-            patch(
-                "email_processor.imap.fetcher.get_imap_password",
-                return_value="password",
-            ),
-            patch("email_processor.imap.fetcher.imap_connect", return_value=mock_mail),
-        ):
-            result = self.processor.process(dry_run=False)
-            # Should handle logout errors gracefully
-            self.assertIsInstance(result, type(result))
-
-    def test_process_logout_attribute_error(self):
-        """Test process handles AttributeError during logout."""
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
-        mock_mail.search.return_value = ("OK", [b""])
-        mock_mail.logout.side_effect = AttributeError("No logout method")
-
-        with (
-            patch(
-                "email_processor.imap.fetcher.get_imap_password",
-                return_value="password",
-            ),
-            patch("email_processor.imap.fetcher.imap_connect", return_value=mock_mail),
-        ):
-            result = self.processor.process(dry_run=False)
-            # Should handle logout errors gracefully
-            self.assertIsInstance(result, type(result))
-
-    def test_process_psutil_memory_error(self):
+    @patch("email_processor.imap.fetcher.PSUTIL_AVAILABLE", True)
+    @patch("email_processor.imap.fetcher.imap_connect")
+    @patch("email_processor.imap.fetcher.get_imap_password", return_value="password")
+    def test_process_psutil_memory_error(self, mock_get_password, mock_imap_connect):
         """Test process handles errors when getting memory usage with psutil."""
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
-        mock_mail.search.return_value = ("OK", [b""])
+        mock_mail = make_imap_stub()
 
         # Create a mock psutil module
-        mock_psutil = MagicMock()
+        mock_psutil = Mock(spec_set=["Process"])
         mock_psutil.Process.side_effect = Exception("psutil error")
 
-        # Inject mock psutil into sys.modules and the email_processor module
-        with (
-            patch(
-                "email_processor.imap.fetcher.get_imap_password",
-                return_value="password",
-            ),
-            patch("email_processor.imap.fetcher.imap_connect", return_value=mock_mail),
-            patch("email_processor.imap.fetcher.PSUTIL_AVAILABLE", True),
-        ):
-            # Manually inject psutil into the module
-            import email_processor.imap.fetcher as ep_module
+        mock_imap_connect.return_value = mock_mail
 
-            original_psutil = getattr(ep_module, "psutil", None)
-            ep_module.psutil = mock_psutil
-            try:
-                result = self.processor.process(dry_run=False)
-                # Should handle psutil errors gracefully
-                self.assertIsInstance(result, type(result))
-            finally:
-                if original_psutil is not None:
-                    ep_module.psutil = original_psutil
-                elif hasattr(ep_module, "psutil"):
-                    delattr(ep_module, "psutil")
+        with patch.object(fetcher_module, "psutil", mock_psutil, create=True):
+            result = self.processor.process(dry_run=False)
+            # Should handle psutil errors gracefully
+            self.assertIsInstance(result, type(result))
 
-    def test_process_psutil_memory_metrics_exception(self):
+    @patch("email_processor.imap.fetcher.PSUTIL_AVAILABLE", True)
+    @patch("email_processor.imap.fetcher.imap_connect")
+    @patch("email_processor.imap.fetcher.get_imap_password", return_value="password")
+    def test_process_psutil_memory_metrics_exception(self, mock_get_password, mock_imap_connect):
         """Test process handles exceptions when calculating psutil memory metrics."""
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
-        mock_mail.search.return_value = ("OK", [b""])
+        mock_mail = make_imap_stub()
         mock_mail.fetch.return_value = ("OK", [b""])
 
         # Create a mock psutil module with Process that raises exception on memory_info()
-        mock_psutil = MagicMock()
-        mock_process_instance = MagicMock()
+        mock_psutil = Mock(spec_set=["Process"])
+        mock_process_instance = Mock(spec_set=["memory_info"])
         mock_process_instance.memory_info.side_effect = Exception("Memory info error")
         mock_psutil.Process.return_value = mock_process_instance
 
-        with (
-            patch(
-                "email_processor.imap.fetcher.get_imap_password",
-                return_value="password",
-            ),
-            patch("email_processor.imap.fetcher.imap_connect", return_value=mock_mail),
-            patch("email_processor.imap.fetcher.PSUTIL_AVAILABLE", True),
-        ):
-            # Manually inject psutil into the module
-            import email_processor.imap.fetcher as ep_module
+        mock_imap_connect.return_value = mock_mail
 
-            original_psutil = getattr(ep_module, "psutil", None)
-            ep_module.psutil = mock_psutil
-            try:
-                result = self.processor.process(dry_run=False)
-                # Should handle psutil errors gracefully
-                self.assertIsInstance(result, type(result))
-            finally:
-                if original_psutil is not None:
-                    ep_module.psutil = original_psutil
-                elif hasattr(ep_module, "psutil"):
-                    delattr(ep_module, "psutil")
+        with patch.object(fetcher_module, "psutil", mock_psutil, create=True):
+            result = self.processor.process(dry_run=False)
+            # Should handle psutil errors gracefully
+            self.assertIsInstance(result, type(result))
 
-    def test_process_psutil_memory_peak_update(self):
+    @patch("email_processor.imap.fetcher.PSUTIL_AVAILABLE", True)
+    @patch("email_processor.imap.fetcher.imap_connect")
+    @patch("email_processor.imap.fetcher.get_imap_password", return_value="password")
+    def test_process_psutil_memory_peak_update(self, mock_get_password, mock_imap_connect):
         """Test process updates memory peak when current memory exceeds peak."""
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
-        mock_mail.search.return_value = ("OK", [b""])
+        mock_mail = make_imap_stub()
         mock_mail.fetch.return_value = ("OK", [b""])
 
         # Create a mock psutil module
-        mock_psutil = MagicMock()
-        mock_process_instance = MagicMock()
+        mock_psutil = Mock(spec_set=["Process"])
+        mock_process_instance = Mock(spec_set=["memory_info"])
         # First call returns lower memory, second call returns higher memory
-        mock_process_instance.memory_info.side_effect = [
-            MagicMock(rss=1000000),  # Initial memory
-            MagicMock(rss=2000000),  # Final memory (higher than initial)
-        ]
+        mock_process_instance.memory_info.side_effect = (MEM_INFO_LOW, MEM_INFO_HIGH)
         mock_psutil.Process.return_value = mock_process_instance
 
-        with (
-            patch(
-                "email_processor.imap.fetcher.get_imap_password",
-                return_value="password",
-            ),
-            patch("email_processor.imap.fetcher.imap_connect", return_value=mock_mail),
-            patch("email_processor.imap.fetcher.PSUTIL_AVAILABLE", True),
-        ):
-            # Manually inject psutil into the module
-            import email_processor.imap.fetcher as ep_module
+        mock_imap_connect.return_value = mock_mail
 
-            original_psutil = getattr(ep_module, "psutil", None)
-            ep_module.psutil = mock_psutil
-            try:
-                result = self.processor.process(dry_run=False)
-                # Should update memory peak
-                self.assertIsInstance(result, type(result))
-                if result.metrics and hasattr(result.metrics, "memory_peak"):
-                    self.assertIsNotNone(result.metrics.memory_peak)
-            finally:
-                if original_psutil is not None:
-                    ep_module.psutil = original_psutil
-                elif hasattr(ep_module, "psutil"):
-                    delattr(ep_module, "psutil")
+        with patch.object(fetcher_module, "psutil", mock_psutil, create=True):
+            result = self.processor.process(dry_run=False)
+            # Should update memory peak
+            self.assertIsInstance(result, type(result))
+            if result.metrics and hasattr(result.metrics, "memory_peak"):
+                self.assertIsNotNone(result.metrics.memory_peak)
 
     def test_process_mock_mode_logging(self):
         """Test process logs mock mode message when mock_mode is True."""
@@ -395,9 +290,7 @@ class TestFetcherErrors(TestFetcherBase):
 
     def test_process_cleanup_unexpected_error(self):
         """Test process handles unexpected cleanup errors."""
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
-        mock_mail.search.return_value = ("OK", [b""])
+        mock_mail = make_imap_stub()
 
         with (
             patch(
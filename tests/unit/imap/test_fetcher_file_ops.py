@@ -1,45 +1,49 @@
 """Tests for Fetcher file_ops functionality."""
 
-from email.mime.base import MIMEBase
-from email.mime.multipart import MIMEMultipart
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
-from tests.unit.imap.test_fetcher_base import TestFetcherBase
+from email_processor.imap import fetcher as fetcher_module
+from email_processor.imap.fetcher import ProcessingMetrics
+from tests.unit.imap.test_fetcher_base import (
+    INVOICE_HEADER_BYTES,
+    INVOICE_MSG_BYTES,
+    INVOICE_PDF_BYTES,
+    TestFetcherBase,
+    make_imap_stub,
+)
 
 
-class TestFetcherFileOps(TestFetcherBase):
-    """Tests for Fetcher file_ops functionality."""
+def _mkdir_failing_for(target: Path, exc: Exception, once: bool = False):
+    """Return a Path.mkdir side effect that raises exc for target and creates other paths.
+
+    With once=True only the first mkdir of target raises; later calls create it.
+    """
+    real_mkdir = Path.mkdir
+    failures = [exc]
+
+    def mkdir(path, *args, **kwargs):
+        if path == target and failures:
+            raise failures.pop() if once else failures[0]
+        return real_mkdir(path, *args, **kwargs)
 
-    def test_process_email_target_folder_create_error(self):
-        """Test _process_email when target folder creation fails."""
-        mock_mail = MagicMock()
-        header_bytes = b"From: sender@example.com\r\nSubject: Invoice\r\nDate: Mon, 1 Jan 2024 12:00:00 +0000\r\n"
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [(None, header_bytes)]),
-        ]
+    return mkdir
 
-        with patch("pathlib.Path.mkdir", side_effect=Exception("Permission denied")):
-            from email_processor.imap.fetcher import ProcessingMetrics
 
-            metrics = ProcessingMetrics()
-            result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-            self.assertEqual(result, "error")
-            self.assertEqual(blocked, 0)
+class TestFetcherFileOps(TestFetcherBase):
+    """Tests for Fetcher file_ops functionality."""
 
     def test_process_file_stats_collection(self):
         """Test file statistics collection in process method."""
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
-        mock_mail.search.return_value = ("OK", [b""])  # No messages
+        mock_mail = make_imap_stub()  # No messages
 
         with (
-            patch(
-                "email_processor.imap.fetcher.get_imap_password",
+            patch.object(
+                fetcher_module,
+                "get_imap_password",
                 return_value="password",
             ),
-            patch("email_processor.imap.fetcher.imap_connect", return_value=mock_mail),
+            patch.object(fetcher_module, "imap_connect", return_value=mock_mail),
         ):
             # Create some test files in folders from topic_mapping
             invoices_dir = Path(self.temp_dir) / "downloads" / "invoices"
@@ -53,142 +57,112 @@ class TestFetcherFileOps(TestFetcherBase):
             # File stats should be None when no emails processed
             self.assertIsNone(result.file_stats)
 
-    def test_process_file_stats_collection_error(self):
-        """Test file statistics collection error handling."""
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
-        mock_mail.search.return_value = ("OK", [b"1"])
-
-        header_bytes = b"From: sender@example.com\r\nSubject: Invoice\r\nDate: Mon, 1 Jan 2024 12:00:00 +0000\r\n"
-
-        msg = MIMEMultipart()
-        msg["From"] = "sender@example.com"
-        msg["Subject"] = "Invoice"
-        msg["Date"] = "Mon, 1 Jan 2024 12:00:00 +0000"
-
-        part = MIMEBase("application", "pdf")
-        part.set_payload(b"test")
-        part.add_header("Content-Disposition", "attachment", filename="test.pdf")
-        msg.attach(part)
-
-        msg_bytes = msg.as_bytes()
-
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [(None, header_bytes)]),
-            ("OK", [(None, msg_bytes)]),
-        ]
-
-        with (
-            patch(
-                "email_processor.imap.fetcher.get_imap_password",
-                return_value="password",
-            ),
-            patch("email_processor.imap.fetcher.imap_connect", return_value=mock_mail),
-            patch("pathlib.Path.rglob", side_effect=Exception("Access error")),
+    @patch.object(fetcher_module, "get_logger")
+    def test_process_email_target_folder_create_errors(self, mock_get_logger):
+        """Test _process_email when creating the target folder raises."""
+        invoices_dir = (Path(self.temp_dir) / "downloads" / "invoices").resolve()
+        for exc, event in (
+            (OSError("IO error"), "target_folder_create_io_error"),
+            (PermissionError("Permission error"), "target_folder_create_io_error"),
+            (RuntimeError("Unexpected error"), "target_folder_create_unexpected_error"),
+            (Exception("Permission denied"), "target_folder_create_unexpected_error"),
         ):
-            result = self.processor.process(dry_run=False)
-            # Should handle error gracefully
-            self.assertIsInstance(result, type(result))
-
-    def test_process_email_target_folder_create_io_error(self):
-        """Test _process_email when target folder creation raises OSError."""
-        mock_mail = MagicMock()
-        header_bytes = b"From: sender@example.com\r\nSubject: Invoice\r\nDate: Mon, 1 Jan 2024 12:00:00 +0000\r\n"
-        msg_bytes = b"From: sender@example.com\r\nSubject: Invoice\r\n\r\nBody"
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [(None, header_bytes)]),
-            ("OK", [(None, msg_bytes)]),
-        ]
-
-        # Mock Path.mkdir to raise OSError
-        with patch("pathlib.Path.mkdir", side_effect=OSError("IO error")):
-            from email_processor.imap.fetcher import ProcessingMetrics
-
-            metrics = ProcessingMetrics()
-            result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-            self.assertEqual(result, "error")
-            self.assertEqual(blocked, 0)
-
-    def test_process_email_target_folder_create_permission_error(self):
-        """Test _process_email when target folder creation raises PermissionError."""
-        mock_mail = MagicMock()
-        header_bytes = b"From: sender@example.com\r\nSubject: Invoice\r\nDate: Mon, 1 Jan 2024 12:00:00 +0000\r\n"
-        msg_bytes = b"From: sender@example.com\r\nSubject: Invoice\r\n\r\nBody"
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [(None, header_bytes)]),
-            ("OK", [(None, msg_bytes)]),
-        ]
-
-        # Mock Path.mkdir to raise PermissionError
-        with patch("pathlib.Path.mkdir", side_effect=PermissionError("Permission error")):
-            from email_processor.imap.fetcher import ProcessingMetrics
-
-            metrics = ProcessingMetrics()
-            result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-            self.assertEqual(result, "error")
-            self.assertEqual(blocked, 0)
-
-    def test_process_email_target_folder_create_unexpected_error(self):
-        """Test _process_email when target folder creation raises unexpected error."""
-        mock_mail = MagicMock()
-        header_bytes = b"From: sender@example.com\r\nSubject: Invoice\r\nDate: Mon, 1 Jan 2024 12:00:00 +0000\r\n"
-        msg_bytes = b"From: sender@example.com\r\nSubject: Invoice\r\n\r\nBody"
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [(None, header_bytes)]),
-            ("OK", [(None, msg_bytes)]),
-        ]
-
-        # Mock Path.mkdir to raise unexpected error
-        with patch("pathlib.Path.mkdir", side_effect=RuntimeError("Unexpected error")):
-            from email_processor.imap.fetcher import ProcessingMetrics
-
-            metrics = ProcessingMetrics()
-            result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-            self.assertEqual(result, "error")
-            self.assertEqual(blocked, 0)
-
-    def test_process_file_statistics_error(self):
+            with (
+                self.subTest(exc=type(exc).__name__),
+                patch.object(
+                    Path, "mkdir", autospec=True, side_effect=_mkdir_failing_for(invoices_dir, exc)
+                ),
+            ):
+                mock_get_logger.reset_mock()
+                mock_mail = make_imap_stub()
+
+                # Only the target folder's mkdir fails; the processed-UID store still loads
+                self._assert_process_email_result(
+                    mock_mail, prefetched=("123", INVOICE_HEADER_BYTES)
+                )
+                mock_get_logger.return_value.error.assert_called_once_with(
+                    event, error=str(exc), error_type=type(exc).__name__
+                )
+                mock_mail.fetch.assert_not_called()
+
+    @patch.object(fetcher_module, "count_files_by_extension")
+    @patch.object(fetcher_module, "imap_connect")
+    @patch.object(fetcher_module, "get_imap_password", return_value="password")
+    def test_process_file_statistics_errors(self, mock_get_password, mock_connect, mock_count):
         """Test process handles errors when collecting file statistics."""
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
-        mock_mail.search.return_value = ("OK", [b""])
-
-        with (
-            patch(
-                "email_processor.imap.fetcher.get_imap_password",
-                return_value="password",
-            ),
-            patch("email_processor.imap.fetcher.imap_connect", return_value=mock_mail),
-            patch(
-                "email_processor.imap.fetcher.Path.iterdir",
-                side_effect=OSError("Permission denied"),
-            ),
-        ):
-            result = self.processor.process(dry_run=False)
-            # Should handle file statistics errors gracefully
-            self.assertIsInstance(result, type(result))
-
-    def test_process_file_statistics_unexpected_error(self):
-        """Test process handles unexpected errors when collecting file statistics."""
-        mock_mail = MagicMock()
-        mock_mail.select.return_value = ("OK", [b"1"])
-        mock_mail.search.return_value = ("OK", [b""])
-
-        with (
-            patch(
-                "email_processor.imap.fetcher.get_imap_password",
-                return_value="password",
-            ),
-            patch("email_processor.imap.fetcher.imap_connect", return_value=mock_mail),
-            patch(
-                "email_processor.imap.fetcher.Path.iterdir",
-                side_effect=ValueError("Unexpected error"),
+        for uid, exc in enumerate(
+            (
+                OSError("Permission denied"),
+                ValueError("Unexpected error"),
+                Exception("Access error"),
             ),
+            start=300,
         ):
-            result = self.processor.process(dry_run=False)
-            # Should handle file statistics errors gracefully
-            self.assertIsInstance(result, type(result))
+            with self.subTest(exc=type(exc).__name__):
+                # Batched UID + header fetch, then the full message; a fresh UID each
+                # case so the message is processed and the statistics step is reached
+                mock_connect.return_value = make_imap_stub(
+                    (
+                        (
+                            "OK",
+                            [
+                                (
+                                    b"1 (UID %d BODY[HEADER.FIELDS (FROM SUBJECT DATE)] {90}" % uid,
+                                    INVOICE_HEADER_BYTES,
+                                ),
+                                b")",
+                            ],
+                        ),
+                        ("OK", [(None, INVOICE_PDF_BYTES)]),
+                    ),
+                    search_ids=b"1",
+                )
+                mock_count.reset_mock()
+                mock_count.side_effect = exc
+
+                result = self.processor.process(dry_run=False)
+                # Should handle file statistics errors gracefully
+                self.assertEqual(result.processed, 1)
+                mock_count.assert_called()
+
+    def test_process_email_target_folder_created_once(self):
+        """Test the target folder is resolved and created only for the first message."""
+        mock_mail = make_imap_stub()
+        mock_mail.fetch.return_value = ("OK", [(None, INVOICE_MSG_BYTES)])
+
+        metrics = ProcessingMetrics()
+        invoices_dir = (Path(self.temp_dir) / "downloads" / "invoices").resolve()
+        invoices_dir.parent.mkdir(parents=True, exist_ok=True)
+        real_mkdir = Path.mkdir
+        with patch.object(Path, "mkdir", autospec=True, side_effect=real_mkdir) as mock_mkdir:
+            for uid in ("123", "124"):
+                self.processor._process_email(
+                    mock_mail, b"1", {}, False, metrics, (uid, INVOICE_HEADER_BYTES)
+                )
+
+        target_calls = [c for c in mock_mkdir.call_args_list if c.args[0] == invoices_dir]
+        self.assertEqual(len(target_calls), 1)
+
+    def test_process_email_target_folder_retried_after_failure(self):
+        """Test a failed target folder mkdir is not cached and is retried for the next message."""
+        mock_mail = make_imap_stub()
+        mock_mail.fetch.return_value = ("OK", [(None, INVOICE_PDF_BYTES)])
+
+        invoices_dir = (Path(self.temp_dir) / "downloads" / "invoices").resolve()
+        # With the parent in place, mkdir(parents=True) touches only the target itself
+        invoices_dir.parent.mkdir(parents=True, exist_ok=True)
+        mkdir = _mkdir_failing_for(invoices_dir, OSError("Device busy"), once=True)
+
+        metrics = ProcessingMetrics()
+        with patch.object(Path, "mkdir", autospec=True, side_effect=mkdir) as mock_mkdir:
+            results = [
+                self.processor._process_email(
+                    mock_mail, b"1", {}, False, metrics, (uid, INVOICE_HEADER_BYTES)
+                )
+                for uid in ("123", "124")
+            ]
+
+        self.assertEqual(results, [("error", 0), ("processed", 0)])
+        target_calls = [c for c in mock_mkdir.call_args_list if c.args[0] == invoices_dir]
+        self.assertEqual(len(target_calls), 2)
+        self.assertEqual([p.name for p in invoices_dir.iterdir()], ["test.pdf"])
@@ -1,8 +1,18 @@
 """Tests for Fetcher header functionality."""
 
-from unittest.mock import MagicMock, patch
+import imaplib
+from unittest.mock import Mock, patch
 
-from tests.unit.imap.test_fetcher_base import TestFetcherBase
+from email_processor.imap import fetcher as fetcher_module
+from email_processor.imap.fetcher import ProcessingMetrics
+from tests.unit.imap.test_fetcher_base import (
+    HEADER_FETCH_RESPONSES,
+    INVOICE_HEADER_BYTES,
+    UID_RESPONSE,
+    RaisingItems,
+    TestFetcherBase,
+    make_imap_stub,
+)
 
 
 class TestFetcherHeader(TestFetcherBase):
@@ -10,242 +20,67 @@ class TestFetcherHeader(TestFetcherBase):
 
     def test_process_email_header_empty(self):
         """Test _process_email when header is empty."""
-        mock_mail = MagicMock()
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [(None, b"")]),  # Empty header
-        ]
-
-        from email_processor.imap.fetcher import ProcessingMetrics
-
-        metrics = ProcessingMetrics()
-        result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-        self.assertEqual(result, "skipped")
-        self.assertEqual(blocked, 0)
-
-    def test_process_email_header_parse_error(self):
-        """Test _process_email when header parsing fails."""
-        mock_mail = MagicMock()
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [(None, b"Invalid header")]),
-        ]
-
-        with patch(
-            "email_processor.imap.fetcher.message_from_bytes",
-            side_effect=Exception("Parse error"),
-        ):
-            from email_processor.imap.fetcher import ProcessingMetrics
-
-            metrics = ProcessingMetrics()
-            result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-            self.assertEqual(result, "error")
-            self.assertEqual(blocked, 0)
-
-    def test_process_email_header_fetch_imap_error(self):
-        """Test _process_email when header fetch raises IMAP4.error."""
-        import imaplib
-
-        mock_mail = MagicMock()
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),  # UID fetch succeeds
-            imaplib.IMAP4.error("IMAP error"),  # Header fetch fails
-        ]
-
-        from email_processor.imap.fetcher import ProcessingMetrics
-
-        metrics = ProcessingMetrics()
-        result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-        self.assertEqual(result, "error")
-        self.assertEqual(blocked, 0)
-
-    def test_process_email_header_fetch_data_error_attribute_error(self):
-        """Test _process_email when header fetch raises AttributeError."""
-        mock_mail = MagicMock()
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),  # UID fetch succeeds
-            AttributeError("Attribute error"),  # Header fetch fails
-        ]
-
-        from email_processor.imap.fetcher import ProcessingMetrics
-
-        metrics = ProcessingMetrics()
-        result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-        self.assertEqual(result, "error")
-        self.assertEqual(blocked, 0)
-
-    def test_process_email_header_fetch_data_error_index_error(self):
-        """Test _process_email when header fetch raises IndexError."""
-        mock_mail = MagicMock()
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),  # UID fetch succeeds
-            IndexError("Index error"),  # Header fetch fails
-        ]
-
-        from email_processor.imap.fetcher import ProcessingMetrics
-
-        metrics = ProcessingMetrics()
-        result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-        self.assertEqual(result, "error")
-        self.assertEqual(blocked, 0)
-
-    def test_process_email_header_fetch_data_error_type_error(self):
-        """Test _process_email when header fetch raises TypeError."""
-        mock_mail = MagicMock()
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),  # UID fetch succeeds
-            TypeError("Type error"),  # Header fetch fails
-        ]
-
-        from email_processor.imap.fetcher import ProcessingMetrics
-
-        metrics = ProcessingMetrics()
-        result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-        self.assertEqual(result, "error")
-        self.assertEqual(blocked, 0)
-
-    def test_process_email_header_fetch_unexpected_error(self):
-        """Test _process_email when header fetch raises unexpected error."""
-        mock_mail = MagicMock()
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),  # UID fetch succeeds
-            RuntimeError("Unexpected error"),  # Header fetch fails
-        ]
-
-        from email_processor.imap.fetcher import ProcessingMetrics
-
-        metrics = ProcessingMetrics()
-        result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-        self.assertEqual(result, "error")
-        self.assertEqual(blocked, 0)
-
-    def test_process_email_header_parse_error_message_parse_error(self):
-        """Test _process_email when header parsing raises MessageParseError."""
-        import email.errors
-
-        mock_mail = MagicMock()
-        header_bytes = b"Invalid header"
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [(None, header_bytes)]),
-        ]
+        mock_mail = make_imap_stub(
+            (
+                UID_RESPONSE,
+                ("OK", [(None, b"")]),  # Empty header
+            )
+        )
 
-        with patch(
-            "email_processor.imap.fetcher.message_from_bytes",
-            side_effect=email.errors.MessageParseError("Parse error"),
-        ):
-            from email_processor.imap.fetcher import ProcessingMetrics
+        self._assert_process_email_result(mock_mail, "skipped")
 
-            metrics = ProcessingMetrics()
-            result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-            self.assertEqual(result, "error")
-            self.assertEqual(blocked, 0)
+    def test_fetch_uid_and_header(self):
+        """Test _fetch_uid_and_header returns the UID and raw header bytes."""
+        mock_mail = make_imap_stub(HEADER_FETCH_RESPONSES)
 
-    def test_process_email_header_parse_error_unicode_decode_error(self):
-        """Test _process_email when header parsing raises UnicodeDecodeError."""
-        mock_mail = MagicMock()
-        header_bytes = b"Invalid header"
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [(None, header_bytes)]),
-        ]
+        fetched = self.processor._fetch_uid_and_header(mock_mail, b"1", ProcessingMetrics())
+        self.assertEqual(fetched, ("123", INVOICE_HEADER_BYTES))
 
-        with patch(
-            "email_processor.imap.fetcher.message_from_bytes",
-            side_effect=UnicodeDecodeError("utf-8", b"", 0, 1, "invalid"),
+    def test_fetch_uid_and_header_fetch_errors(self):
+        """Test _fetch_uid_and_header when the header fetch raises."""
+        for exc in (
+            imaplib.IMAP4.error("IMAP error"),
+            AttributeError("Attribute error"),
+            IndexError("Index error"),
+            TypeError("Type error"),
+            RuntimeError("Unexpected error"),
         ):
-            from email_processor.imap.fetcher import ProcessingMetrics
-
-            metrics = ProcessingMetrics()
-            result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-            self.assertEqual(result, "error")
-            self.assertEqual(blocked, 0)
-
-    def test_process_email_header_parse_data_error_attribute_error(self):
-        """Test _process_email when header parsing raises AttributeError."""
-        mock_mail = MagicMock()
-
-        # Create header_data that will cause AttributeError when accessing [0][1] or [0]
-        class BadHeaderData:
-            def __getitem__(self, key):
-                if key == 0:
-                    raise AttributeError("Attribute error")
-                raise IndexError("Index error")
-
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [BadHeaderData()]),  # Invalid header data that causes AttributeError
-        ]
-
-        from email_processor.imap.fetcher import ProcessingMetrics
-
-        metrics = ProcessingMetrics()
-        result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-        self.assertEqual(result, "error")
-        self.assertEqual(blocked, 0)
-
-    def test_process_email_header_parse_data_error_index_error(self):
-        """Test _process_email when header parsing raises IndexError."""
-        mock_mail = MagicMock()
-
-        # Create header_data that will cause IndexError when accessing [0]
-        class BadHeaderData:
-            def __getitem__(self, key):
-                raise IndexError("Index error")
-
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [BadHeaderData()]),  # Invalid header data that causes IndexError
-        ]
-
-        from email_processor.imap.fetcher import ProcessingMetrics
-
-        metrics = ProcessingMetrics()
-        result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-        self.assertEqual(result, "error")
-        self.assertEqual(blocked, 0)
-
-    def test_process_email_header_parse_data_error_type_error(self):
-        """Test _process_email when header parsing raises TypeError."""
-        mock_mail = MagicMock()
-
-        # Create header_data that will cause TypeError when accessing [0][1] or [0]
-        class BadHeaderData:
-            def __getitem__(self, key):
-                if key == 0:
-                    raise TypeError("Type error")
-                raise IndexError("Index error")
-
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [BadHeaderData()]),  # Invalid header data that causes TypeError
-        ]
-
-        from email_processor.imap.fetcher import ProcessingMetrics
-
-        metrics = ProcessingMetrics()
-        result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-        self.assertEqual(result, "error")
-        self.assertEqual(blocked, 0)
-
-    def test_process_email_header_parse_unexpected_error(self):
-        """Test _process_email when header parsing raises unexpected error."""
-        mock_mail = MagicMock()
-        header_bytes = (
-            b"From: sender@example.com\r\nSubject: Test\r\nDate: Mon, 1 Jan 2024 12:00:00 +0000\r\n"
+            with self.subTest(exc=type(exc).__name__):
+                mock_mail = make_imap_stub(
+                    (
+                        UID_RESPONSE,  # UID fetch succeeds
+                        exc,  # Header fetch fails
+                    )
+                )
+
+                fetched = self.processor._fetch_uid_and_header(mock_mail, b"1", ProcessingMetrics())
+                self.assertEqual(fetched, "error")
+
+    @patch.object(fetcher_module, "get_logger")
+    def test_fetch_uid_and_header_malformed_header_item(self, mock_get_logger):
+        """Test _fetch_uid_and_header when the header item is a tuple without a literal."""
+        mock_mail = make_imap_stub((UID_RESPONSE, ("OK", [(b"1 (UID 123)",)])))
+
+        fetched = self.processor._fetch_uid_and_header(mock_mail, b"1", ProcessingMetrics())
+
+        self.assertEqual(fetched, "error")
+        mock_get_logger.return_value.warning.assert_called_once_with(
+            "header_fetch_data_error", error="tuple index out of range", error_type="IndexError"
         )
-        mock_mail.fetch.side_effect = [
-            ("OK", [(b"UID 123 SIZE 1000", None)]),
-            ("OK", [(None, header_bytes)]),
-        ]
 
-        with patch(
-            "email_processor.imap.fetcher.message_from_bytes",
-            side_effect=RuntimeError("Unexpected error"),
+    @patch.object(fetcher_module, "extract_header_fields")
+    def test_process_email_header_parse_unexpected_error(self, mock_extract):
+        """Test _process_email when header parsing raises unexpectedly."""
+        mock_extract.side_effect = RuntimeError("Unexpected error")
+        self._assert_process_email_result(Mock(), prefetched=("123", b"Invalid header"))
+
+    def test_process_email_header_parse_data_errors(self):
+        """Test _process_email when indexing the header data raises."""
+        for exc in (
+            AttributeError("Attribute error"),
+            IndexError("Index error"),
+            TypeError("Type error"),
         ):
-            from email_processor.imap.fetcher import ProcessingMetrics
-
-            metrics = ProcessingMetrics()
-            result, blocked = self.processor._process_email(mock_mail, b"1", {}, False, metrics)
-            self.assertEqual(result, "error")
-            self.assertEqual(blocked, 0)
+            with self.subTest(exc=type(exc).__name__):
+                # Header data that fails on access
+                self._assert_process_email_result(Mock(), prefetched=("123", RaisingItems(exc)))
@@ -1,6 +1,7 @@
 """Tests for SMTP client module."""
 
 import logging
+import smtplib
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -58,8 +59,6 @@ class TestSMTPConnection(unittest.TestCase):
     @patch("time.sleep")
     def test_smtp_connect_retry(self, mock_sleep, mock_smtp_class):
         """Test SMTP connection with retries."""
-        import smtplib
-
         # First two attempts raise exception on login, third succeeds
         mock_smtp1 = MagicMock()
         mock_smtp1.login.side_effect = smtplib.SMTPException("Connection failed")
@@ -81,8 +80,6 @@ class TestSMTPConnection(unittest.TestCase):
     @patch("email_processor.smtp.client.smtplib.SMTP")
     def test_smtp_connect_authentication_error(self, mock_smtp_class):
         """Test SMTP connection with authentication error."""
-        import smtplib
-
         mock_smtp = MagicMock()
         mock_smtp.login.side_effect = smtplib.SMTPAuthenticationError(535, "Authentication failed")
         mock_smtp_class.return_value = mock_smtp
@@ -104,8 +101,6 @@ class TestSMTPConnection(unittest.TestCase):
     @patch("time.sleep")
     def test_smtp_connect_max_retries_exceeded(self, mock_sleep, mock_smtp_class):
         """Test SMTP connection when max retries exceeded."""
-        import smtplib
-
         mock_smtp = MagicMock()
         mock_smtp.login.side_effect = smtplib.SMTPException("Connection failed")
         mock_smtp_class.return_value = mock_smtp
@@ -145,8 +140,6 @@ class TestSMTPConnection(unittest.TestCase):
         # This is a defensive programming check that should never execute.
         # For coverage purposes, we'll test the normal retry failure path which
         # raises from the except block, not the final fallback.
-        import smtplib
-
         mock_smtp = MagicMock()
         mock_smtp.login.side_effect = smtplib.SMTPException("Connection failed")
         mock_smtp_class.return_value = mock_smtp
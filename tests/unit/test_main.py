@@ -1,5 +1,6 @@
 """Tests for __main__ module entry point."""
 
+import copy
 import tempfile
 import unittest
 from pathlib import Path
@@ -11,6 +12,21 @@ from email_processor.cli.commands.config import create_default_config
 from email_processor.exit_codes import ExitCode
 from email_processor.imap.fetcher import ProcessingMetrics, ProcessingResult
 
+# Minimal config for the run command; main() fills in defaults, so hand out copies
+RUN_CONFIG = {
+    "imap": {
+        "server": "imap.example.com",
+        "user": "test@example.com",
+    },
+    "processing": {},
+    "allowed_senders": [],
+}
+
+
+def _run_config() -> dict:
+    """Return a fresh copy of RUN_CONFIG for ConfigLoader.load to hand to main()."""
+    return copy.deepcopy(RUN_CONFIG)
+
 
 class TestMainEntryPoint(unittest.TestCase):
     """Tests for main entry point."""
@@ -92,68 +108,6 @@ class TestMainEntryPoint(unittest.TestCase):
         finally:
             Path(pwd_file).unlink(missing_ok=True)
 
-    @patch("email_processor.config.loader.ConfigLoader.load")
-    @patch("email_processor.imap.auth.get_imap_password")
-    @patch("email_processor.imap.client.imap_connect")
-    @patch("email_processor.cli.commands.imap.EmailProcessor")
-    def test_main_normal_mode(
-        self, mock_processor_class, mock_imap_connect, mock_get_password, mock_load_config
-    ):
-        """Test main function in normal processing mode."""
-        mock_load_config.return_value = {
-            "imap": {
-                "server": "imap.example.com",
-                "user": "test@example.com",
-            },
-            "processing": {},
-            "allowed_senders": [],
-        }
-        mock_processor = MagicMock()
-        metrics = ProcessingMetrics(total_time=1.5)
-        mock_processor.process.return_value = ProcessingResult(
-            processed=5, skipped=3, errors=1, file_stats={}, metrics=metrics
-        )
-        mock_get_password.return_value = "password"
-        mock_processor_class.return_value = mock_processor
-
-        with patch("sys.argv", ["email_processor", "run"]):
-            result = main()
-            self.assertEqual(result, ExitCode.SUCCESS)
-            mock_processor.process.assert_called_once_with(
-                dry_run=False, mock_mode=False, config_path="config.yaml"
-            )
-
-    @patch("email_processor.config.loader.ConfigLoader.load")
-    @patch("email_processor.imap.auth.get_imap_password")
-    @patch("email_processor.imap.client.imap_connect")
-    @patch("email_processor.cli.commands.imap.EmailProcessor")
-    def test_main_dry_run_mode(
-        self, mock_processor_class, mock_imap_connect, mock_get_password, mock_load_config
-    ):
-        """Test main function in dry-run mode."""
-        mock_load_config.return_value = {
-            "imap": {
-                "server": "imap.example.com",
-                "user": "test@example.com",
-            },
-            "processing": {},
-            "allowed_senders": [],
-        }
-        mock_processor = MagicMock()
-        metrics = ProcessingMetrics(total_time=0.5)
-        mock_processor.process.return_value = ProcessingResult(
-            processed=0, skipped=0, errors=0, file_stats={}, metrics=metrics
-        )
-        mock_get_password.return_value = "password"
-        mock_processor_class.return_value = mock_processor
-
-        with patch("sys.argv", ["email_processor", "run", "--dry-run"]):
-            result = main()
-            self.assertEqual(result, ExitCode.SUCCESS)
-            mock_processor.process.assert_called_once_with(
-                dry_run=True, mock_mode=False, config_path="config.yaml"
-            )
-
     @patch("email_processor.config.loader.ConfigLoader.load")
     def test_main_config_file_not_found(self, mock_load_config):
         """Test main function when config file not found."""
@@ -174,159 +128,6 @@ class TestMainEntryPoint(unittest.TestCase):
             result = main()
             self.assertEqual(result, ExitCode.CONFIG_ERROR)
 
-    @patch("email_processor.config.loader.ConfigLoader.load")
-    @patch("email_processor.imap.auth.get_imap_password")
-    @patch("email_processor.imap.client.imap_connect")
-    @patch("email_processor.cli.commands.imap.EmailProcessor")
-    def test_main_custom_config_path(
-        self, mock_processor_class, mock_imap_connect, mock_get_password, mock_load_config
-    ):
-        """Test main function with custom config path."""
-        mock_load_config.return_value = {
-            "imap": {
-                "server": "imap.example.com",
-                "user": "test@example.com",
-            },
-            "processing": {},
-            "allowed_senders": [],
-        }
-        mock_get_password.return_value = "password"
-        mock_processor = MagicMock()
-        metrics = ProcessingMetrics(total_time=0.8)
-        mock_processor.process.return_value = ProcessingResult(
-            processed=2, skipped=1, errors=0, file_stats={}, metrics=metrics
-        )
-        mock_processor_class.return_value = mock_processor
-
-        with patch("sys.argv", ["email_processor", "--config", "custom_config.yaml"]):
-            result = main()
-            self.assertEqual(result, ExitCode.SUCCESS)
-            # ConfigLoader.load is called with ui parameter
-            mock_load_config.assert_called_once()
-            call_args = mock_load_config.call_args
-            self.assertEqual(call_args[0][0], "custom_config.yaml")
-            self.assertIn("ui", call_args[1])
-            mock_processor.process.assert_called_once_with(
-                dry_run=False, mock_mode=False, config_path="custom_config.yaml"
-            )
-
-    @patch("email_processor.config.loader.ConfigLoader.load")
-    @patch("email_processor.imap.auth.get_imap_password")
-    @patch("email_processor.imap.client.imap_connect")
-    @patch("email_processor.cli.commands.imap.EmailProcessor")
-    def test_main_with_mock_metrics(
-        self, mock_processor_class, mock_imap_connect, mock_get_password, mock_load_config
-    ):
-        """Test main function handles ProcessingResult with MagicMock metrics gracefully."""
-        mock_load_config.return_value = {
-            "imap": {
-                "server": "imap.example.com",
-                "user": "test@example.com",
-            },
-            "processing": {},
-            "allowed_senders": [],
-        }
-        mock_processor = MagicMock()
-        # Create ProcessingResult with MagicMock metrics to test error handling
-        mock_result = ProcessingResult(
-            processed=1, skipped=0, errors=0, file_stats={}, metrics=MagicMock()
-        )
-        mock_processor.process.return_value = mock_result
-        mock_get_password.return_value = "password"
-        mock_processor_class.return_value = mock_processor
-
-        with patch("sys.argv", ["email_processor"]):
-            result = main()
-            # Should not crash, even with MagicMock metrics
-            self.assertEqual(result, ExitCode.SUCCESS)
-            mock_processor.process.assert_called_once_with(
-                dry_run=False, mock_mode=False, config_path="config.yaml"
-            )
-
-    @patch("email_processor.config.loader.ConfigLoader.load")
-    @patch("email_processor.imap.auth.get_imap_password")
-    @patch("email_processor.imap.client.imap_connect")
-    @patch("email_processor.cli.commands.imap.EmailProcessor")
-    def test_main_with_none_metrics(
-        self, mock_processor_class, mock_imap_connect, mock_get_password, mock_load_config
-    ):
-        """Test main function handles ProcessingResult with None metrics gracefully."""
-        mock_load_config.return_value = {
-            "imap": {
-                "server": "imap.example.com",
-                "user": "test@example.com",
-            },
-            "processing": {},
-            "allowed_senders": [],
-        }
-        mock_processor = MagicMock()
-        # Create ProcessingResult with None metrics
-        mock_result = ProcessingResult(
-            processed=1, skipped=0, errors=0, file_stats={}, metrics=None
-        )
-        mock_processor.process.return_value = mock_result
-        mock_get_password.return_value = "password"
-        mock_processor_class.return_value = mock_processor
-
-        with patch("sys.argv", ["email_processor"]):
-            result = main()
-            # Should not crash, even with None metrics
-            self.assertEqual(result, ExitCode.SUCCESS)
-            mock_processor.process.assert_called_once_with(
-                dry_run=False, mock_mode=False, config_path="config.yaml"
-            )
-
-    @patch("email_processor.config.loader.ConfigLoader.load")
-    @patch("email_processor.imap.auth.get_imap_password")
-    @patch("email_processor.imap.client.imap_connect")
-    @patch("email_processor.cli.commands.imap.EmailProcessor")
-    def test_main_keyboard_interrupt(
-        self, mock_processor_class, mock_imap_connect, mock_get_password, mock_load_config
-    ):
-        """Test main function handles KeyboardInterrupt."""
-        mock_load_config.return_value = {
-            "imap": {
-                "server": "imap.example.com",
-                "user": "test@example.com",
-            },
-            "processing": {},
-            "allowed_senders": [],
-        }
-        mock_get_password.return_value = "password"
-        mock_processor = MagicMock()
-        mock_processor.process.side_effect = KeyboardInterrupt()
-        mock_processor_class.return_value = mock_processor
-
-        with patch("sys.argv", ["email_processor"]):
-            result = main()
-            self.assertEqual(result, ExitCode.SUCCESS)
-
-    @patch("email_processor.config.loader.ConfigLoader.load")
-    @patch("email_processor.imap.auth.get_imap_password")
-    @patch("email_processor.imap.client.imap_connect")
-    @patch("email_processor.cli.commands.imap.EmailProcessor")
-    def test_main_processing_error(
-        self, mock_processor_class, mock_imap_connect, mock_get_password, mock_load_config
-    ):
-        """Test main function handles processing errors."""
-        mock_load_config.return_value = {
-            "imap": {
-                "server": "imap.example.com",
-                "user": "test@example.com",
-            },
-            "processing": {},
-            "allowed_senders": [],
-        }
-        mock_processor = MagicMock()
-        mock_processor.process.side_effect = Exception("Processing error")
-        mock_processor_class.return_value = mock_processor
-
-        with patch("sys.argv", ["email_processor", "run"]):
-            result = main()
-            from email_processor.exit_codes import ExitCode
-
-            self.assertEqual(result, ExitCode.PROCESSING_ERROR)
-
     @patch("email_processor.cli.commands.config.Path")
     @patch("email_processor.cli.commands.config.shutil.copy2")
     def test_create_default_config_success(self, mock_copy, mock_path_class):
@@ -448,6 +249,150 @@ class TestMainEntryPoint(unittest.TestCase):
             self.assertEqual(call_args[0], "custom.yaml")
 
 
+@patch("email_processor.config.loader.ConfigLoader.load")
+@patch("email_processor.imap.auth.get_imap_password")
+@patch("email_processor.imap.client.imap_connect")
+@patch("email_processor.cli.commands.imap.EmailProcessor")
+class TestMainProcessing(unittest.TestCase):
+    """Tests for main() running the processor, with config, IMAP and processor patched."""
+
+    def test_main_normal_mode(
+        self, mock_processor_class, mock_imap_connect, mock_get_password, mock_load_config
+    ):
+        """Test main function in normal processing mode."""
+        mock_load_config.return_value = _run_config()
+        mock_processor = MagicMock()
+        metrics = ProcessingMetrics(total_time=1.5)
+        mock_processor.process.return_value = ProcessingResult(
+            processed=5, skipped=3, errors=1, file_stats={}, metrics=metrics
+        )
+        mock_get_password.return_value = "password"
+        mock_processor_class.return_value = mock_processor
+
+        with patch("sys.argv", ["email_processor", "run"]):
+            result = main()
+            self.assertEqual(result, ExitCode.SUCCESS)
+            mock_processor.process.assert_called_once_with(
+                dry_run=False, mock_mode=False, config_path="config.yaml"
+            )
+
+    def test_main_dry_run_mode(
+        self, mock_processor_class, mock_imap_connect, mock_get_password, mock_load_config
+    ):
+        """Test main function in dry-run mode."""
+        mock_load_config.return_value = _run_config()
+        mock_processor = MagicMock()
+        metrics = ProcessingMetrics(total_time=0.5)
+        mock_processor.process.return_value = ProcessingResult(
+            processed=0, skipped=0, errors=0, file_stats={}, metrics=metrics
+        )
+        mock_get_password.return_value = "password"
+        mock_processor_class.return_value = mock_processor
+
+        with patch("sys.argv", ["email_processor", "run", "--dry-run"]):
+            result = main()
+            self.assertEqual(result, ExitCode.SUCCESS)
+            mock_processor.process.assert_called_once_with(
+                dry_run=True, mock_mode=False, config_path="config.yaml"
+            )
+
+    def test_main_custom_config_path(
+        self, mock_processor_class, mock_imap_connect, mock_get_password, mock_load_config
+    ):
+        """Test main function with custom config path."""
+        mock_load_config.return_value = _run_config()
+        mock_get_password.return_value = "password"
+        mock_processor = MagicMock()
+        metrics = ProcessingMetrics(total_time=0.8)
+        mock_processor.process.return_value = ProcessingResult(
+            processed=2, skipped=1, errors=0, file_stats={}, metrics=metrics
+        )
+        mock_processor_class.return_value = mock_processor
+
+        with patch("sys.argv", ["email_processor", "--config", "custom_config.yaml"]):
+            result = main()
+            self.assertEqual(result, ExitCode.SUCCESS)
+            # ConfigLoader.load is called with ui parameter
+            mock_load_config.assert_called_once()
+            call_args = mock_load_config.call_args
+            self.assertEqual(call_args[0][0], "custom_config.yaml")
+            self.assertIn("ui", call_args[1])
+            mock_processor.process.assert_called_once_with(
+                dry_run=False, mock_mode=False, config_path="custom_config.yaml"
+            )
+
+    def test_main_with_mock_metrics(
+        self, mock_processor_class, mock_imap_connect, mock_get_password, mock_load_config
+    ):
+        """Test main function handles ProcessingResult with MagicMock metrics gracefully."""
+        mock_load_config.return_value = _run_config()
+        mock_processor = MagicMock()
+        # Create ProcessingResult with MagicMock metrics to test error handling
+        mock_result = ProcessingResult(
+            processed=1, skipped=0, errors=0, file_stats={}, metrics=MagicMock()
+        )
+        mock_processor.process.return_value = mock_result
+        mock_get_password.return_value = "password"
+        mock_processor_class.return_value = mock_processor
+
+        with patch("sys.argv", ["email_processor"]):
+            result = main()
+            # Should not crash, even with MagicMock metrics
+            self.assertEqual(result, ExitCode.SUCCESS)
+            mock_processor.process.assert_called_once_with(
+                dry_run=False, mock_mode=False, config_path="config.yaml"
+            )
+
+    def test_main_with_none_metrics(
+        self, mock_processor_class, mock_imap_connect, mock_get_password, mock_load_config
+    ):
+        """Test main function handles ProcessingResult with None metrics gracefully."""
+        mock_load_config.return_value = _run_config()
+        mock_processor = MagicMock()
+        # Create ProcessingResult with None metrics
+        mock_result = ProcessingResult(
+            processed=1, skipped=0, errors=0, file_stats={}, metrics=None
+        )
+        mock_processor.process.return_value = mock_result
+        mock_get_password.return_value = "password"
+        mock_processor_class.return_value = mock_processor
+
+        with patch("sys.argv", ["email_processor"]):
+            result = main()
+            # Should not crash, even with None metrics
+            self.assertEqual(result, ExitCode.SUCCESS)
+            mock_processor.process.assert_called_once_with(
+                dry_run=False, mock_mode=False, config_path="config.yaml"
+            )
+
+    def test_main_keyboard_interrupt(
+        self, mock_processor_class, mock_imap_connect, mock_get_password, mock_load_config
+    ):
+        """Test main function handles KeyboardInterrupt."""
+        mock_load_config.return_value = _run_config()
+        mock_get_password.return_value = "password"
+        mock_processor = MagicMock()
+        mock_processor.process.side_effect = KeyboardInterrupt()
+        mock_processor_class.return_value = mock_processor
+
+        with patch("sys.argv", ["email_processor"]):
+            result = main()
+            self.assertEqual(result, ExitCode.SUCCESS)
+
+    def test_main_processing_error(
+        self, mock_processor_class, mock_imap_connect, mock_get_password, mock_load_config
+    ):
+        """Test main function handles processing errors."""
+        mock_load_config.return_value = _run_config()
+        mock_processor = MagicMock()
+        mock_processor.process.side_effect = Exception("Processing error")
+        mock_processor_class.return_value = mock_processor
+
+        with patch("sys.argv", ["email_processor", "run"]):
+            result = main()
+            self.assertEqual(result, ExitCode.PROCESSING_ERROR)
+
+
 class TestDryRunNoConnect(unittest.TestCase):
     """Tests for --dry-run-no-connect mode."""
 
@@ -459,14 +404,7 @@ class TestDryRunNoConnect(unittest.TestCase):
         self, mock_processor_class, mock_imap_connect, mock_get_password, mock_load_config
     ):
         """Test main function in dry-run-no-connect mode."""
-        mock_load_config.return_value = {
-            "imap": {
-                "server": "imap.example.com",
-                "user": "test@example.com",
-            },
-            "processing": {},
-            "allowed_senders": [],
-        }
+        mock_load_config.return_value = _run_config()
         mock_processor = MagicMock()
         metrics = ProcessingMetrics(total_time=0.5)
         mock_processor.process.return_value = ProcessingResult(
@@ -494,14 +432,7 @@ class TestSMTPWarning(unittest.TestCase):
         self, mock_processor_class, mock_imap_connect, mock_get_password, mock_load_config
     ):
         """Test warning when SMTP section is missing and not using SMTP commands."""
-        mock_load_config.return_value = {
-            "imap": {
-                "server": "imap.example.com",
-                "user": "test@example.com",
-            },
-            "processing": {},
-            "allowed_senders": [],
-        }
+        mock_load_config.return_value = _run_config()
         mock_processor = MagicMock()
         metrics = ProcessingMetrics(total_time=0.5)
         mock_processor.process.return_value = ProcessingResult(
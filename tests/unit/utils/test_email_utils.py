@@ -8,6 +8,7 @@ from email_processor.logging.setup import setup_logging
 from email_processor.utils.email_utils import (
     EmailUtils,
     decode_mime_header_value,
+    extract_header_fields,
     parse_email_date,
 )
 
@@ -49,6 +50,40 @@ class TestEmailUtils(unittest.TestCase):
         self.assertIsInstance(result, str)
         self.assertIn("Part", result)
 
+    def test_extract_header_fields_basic(self):
+        """Test raw header scan returns lower-case requested fields only."""
+        raw = (
+            b"From: sender@example.com\r\n"
+            b"SUBJECT: Invoice\r\n"
+            b"Date: Mon, 1 Jan 2024 12:00:00 +0000\r\n"
+            b"X-Other: ignored\r\n\r\n"
+        )
+        self.assertEqual(
+            extract_header_fields(raw),
+            {
+                "from": "sender@example.com",
+                "subject": "Invoice",
+                "date": "Mon, 1 Jan 2024 12:00:00 +0000",
+            },
+        )
+
+    def test_extract_header_fields_folding_and_duplicates(self):
+        """Test folded lines are unfolded and the first occurrence wins."""
+        raw = b"Subject: Monthly\r\n\tinvoice\r\nSubject: second\r\nFrom: a@b.c\r\n"
+        fields = extract_header_fields(raw)
+        self.assertEqual(fields["subject"], "Monthly\tinvoice")
+        self.assertEqual(fields["from"], "a@b.c")
+
+    def test_extract_header_fields_stops_at_blank_line(self):
+        """Test scanning stops at the end of the header block."""
+        raw = b"From: a@b.c\n\nSubject: body text\n"
+        self.assertEqual(extract_header_fields(raw), {"from": "a@b.c"})
+
+    def test_extract_header_fields_non_ascii_and_empty(self):
+        """Test undecodable bytes are replaced and empty input yields no fields."""
+        self.assertEqual(extract_header_fields(b"Subject: \xff ok\r\n")["subject"], "\ufffd ok")
+        self.assertEqual(extract_header_fields(b""), {})
+
     def test_parse_email_date_valid(self):
         """Test email date parsing with valid date."""
         date_str = "Mon, 1 Jan 2024 12:00:00 +0000"
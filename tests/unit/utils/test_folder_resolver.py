@@ -6,6 +6,7 @@ from unittest.mock import MagicMock, patch
 from email_processor.logging.setup import setup_logging
 from email_processor.utils.folder_resolver import (
     FolderResolver,
+    _compile_pattern,
     resolve_custom_folder,
 )
 
@@ -89,3 +90,79 @@ class TestFolderResolver(unittest.TestCase):
         pattern = resolver._compile_pattern(".*test.*")
         self.assertIsNotNone(pattern)
         self.assertTrue(pattern.search("Test Subject"))
+
+    def test_folder_resolver_compiles_rules_once(self):
+        """Test FolderResolver compiles patterns at init, not per resolve."""
+        topic_mapping = {
+            ".*invoice.*": "invoices",
+            ".*report.*": "reports",
+            ".*": "default",
+        }
+        with patch(
+            "email_processor.utils.folder_resolver._compile_pattern",
+            wraps=_compile_pattern,
+        ) as mock_compile:
+            resolver = FolderResolver(topic_mapping)
+            for subject in ("Invoice #1", "Weekly report", "Other"):
+                resolver.resolve(subject)
+        self.assertEqual(mock_compile.call_count, 2)
+
+    def test_folder_resolver_empty_mapping(self):
+        """Test FolderResolver.resolve with empty mapping raises ValueError."""
+        resolver = FolderResolver({})
+        with self.assertRaises(ValueError):
+            resolver.resolve("Test subject")
+
+    def test_folder_resolver_combined_matches_rule_order(self):
+        """Test the combined regex picks the first rule in order, not the leftmost match."""
+        topic_mapping = {
+            ".*invoice.*": "invoices",
+            "report": "reports",
+            "^urgent$": "urgent",
+            ".*": "default",
+        }
+        resolver = FolderResolver(topic_mapping)
+        self.assertIsNotNone(resolver._combined)
+        cases = {
+            "report and INVOICE": "invoices",
+            "weekly report": "reports",
+            "line one\nreport": "reports",
+            "Urgent": "urgent",
+            "not urgent": "default",
+        }
+        for subject, expected in cases.items():
+            with self.subTest(subject=subject):
+                self.assertEqual(resolver.resolve(subject), expected)
+                self.assertEqual(resolve_custom_folder(subject, topic_mapping), expected)
+
+    def test_folder_resolver_uncombinable_patterns_fall_back(self):
+        """Test patterns that cannot be merged are still matched one by one."""
+        cases = {
+            "backreference": ({r"(ab)\1": "double", ".*": "default"}, "abab", "double"),
+            "conditional group": (
+                {r"(<)?x(?(1)>)": "tagged", ".*": "default"},
+                "<x>",
+                "tagged",
+            ),
+            "duplicate group": (
+                {"(?P<n>x)": "first", "(?P<n>y)": "second", ".*": "default"},
+                "y",
+                "second",
+            ),
+        }
+        for name, (topic_mapping, subject, expected) in cases.items():
+            with self.subTest(name):
+                resolver = FolderResolver(topic_mapping)
+                self.assertIsNone(resolver._combined)
+                self.assertEqual(resolver.resolve(subject), expected)
+
+    def test_folder_resolver_inline_flag_rule_not_combined(self):
+        """Test an inline global flag in one rule does not leak into the other rules."""
+        topic_mapping = {"(?x) inv oice": "invoices", "foo bar": "foo", ".*": "default"}
+        resolver = FolderResolver(topic_mapping)
+        self.assertIsNone(resolver._combined)
+        cases = {"invoice": "invoices", "foo bar": "foo", "foobar": "default"}
+        for subject, expected in cases.items():
+            with self.subTest(subject=subject):
+                self.assertEqual(resolver.resolve(subject), expected)
+                self.assertEqual(resolve_custom_folder(subject, topic_mapping), expected)
@@ -1,10 +1,15 @@
 """Tests for path utils module."""
 
 import os
+import tempfile
 import unittest
+from pathlib import Path
+from unittest.mock import patch
 
+from email_processor.utils import path_utils as path_utils_module
 from email_processor.utils.path_utils import (
     PathUtils,
+    count_files_by_extension,
     normalize_folder_name,
     sanitize_filename,
 )
@@ -31,6 +36,47 @@ class TestPathUtils(unittest.TestCase):
         if os.name == "nt":
             self.assertEqual(sanitize_filename("..\\test.pdf"), "test.pdf")
 
+    def test_count_files_by_extension(self):
+        """Test recursive per-extension file counting."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "nested" / "deeper").mkdir(parents=True)
+            for name in ("a.pdf", "nested/b.PDF", "nested/deeper/c.txt", "nested/README"):
+                (root / name).write_bytes(b"x")
+
+            counts = {".pdf": 1}
+            count_files_by_extension(root, counts)
+
+        self.assertEqual(counts, {".pdf": 3, ".txt": 1, "(no extension)": 1})
+
+    @patch.object(path_utils_module, "get_logger")
+    def test_count_files_by_extension_skips_unreadable_folder(self, mock_get_logger):
+        """Test an unreadable subfolder is skipped and the rest is still counted."""
+        real_scandir = os.scandir
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            locked = root / "locked"
+            (locked / "inner").mkdir(parents=True)
+            (root / "other").mkdir()
+            for name in ("a.pdf", "locked/b.pdf", "locked/inner/c.pdf", "other/d.txt"):
+                (root / name).write_bytes(b"x")
+
+            def scandir(path):
+                if path == str(locked):
+                    raise PermissionError(13, "Permission denied", path)
+                return real_scandir(path)
+
+            counts: dict[str, int] = {}
+            with patch.object(path_utils_module.os, "scandir", side_effect=scandir):
+                count_files_by_extension(root, counts)
+
+        self.assertEqual(counts, {".pdf": 1, ".txt": 1})
+        mock_get_logger.return_value.debug.assert_called_once_with(
+            "file_stats_scan_error",
+            path=str(locked),
+            error=f"[Errno 13] Permission denied: '{locked}'",
+        )
+
     def test_path_utils_normalize_folder_name(self):
         """Test PathUtils.normalize_folder_name method."""
         result = PathUtils.normalize_folder_name("test/folder")